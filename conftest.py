@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def post_jobs_without_worker(settings):
+    """Выключает фоновый воркер outbox, как core.test_runner.TestRunner."""
+    settings.POST_JOBS_IN_PROCESS = False
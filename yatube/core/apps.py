@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     """Config для приложения Core."""
     name = 'core'
+
+    def ready(self):
+        from .db import apply_sqlite_pragmas
+        from .template_warmup import warm_up_if_cached
+
+        connection_created.connect(
+            apply_sqlite_pragmas, dispatch_uid='core.apply_sqlite_pragmas'
+        )
+        warm_up_if_cached()
@@ -0,0 +1,179 @@
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from io import BytesIO
+
+import django
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+
+
+class RequestBodyTooLarge(Exception):
+    """Тело запроса больше DATA_UPLOAD_MAX_MEMORY_SIZE."""
+
+
+async def read_body(receive):
+    """Читает тело запроса ASGI; None, если клиент отключился.
+
+    Тело держится в памяти целиком, поэтому оно ограничено
+    DATA_UPLOAD_MAX_MEMORY_SIZE: больше — RequestBodyTooLarge.
+    """
+    limit = settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if limit is not None and size > limit:
+            raise RequestBodyTooLarge
+        chunks.append(chunk)
+        if not message.get('more_body', False):
+            return b''.join(chunks)
+
+
+def header_environ(headers):
+    """Заголовки ASGI в ключах WSGI: HTTP_*, CONTENT_TYPE и т.д."""
+    environ = {}
+    for name, value in headers:
+        key = name.decode('latin-1').upper().replace('-', '_')
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            key = f'HTTP_{key}'
+        value = value.decode('latin-1')
+        if key in environ:
+            separator = '; ' if key == 'HTTP_COOKIE' else ','
+            value = environ[key] + separator + value
+        environ[key] = value
+    return environ
+
+
+def build_environ(scope, body):
+    """Окружение WSGI для запроса ASGI с уже прочитанным телом.
+
+    В scope ASGI path полный, а в WSGI префикс root_path уходит в
+    SCRIPT_NAME, и PATH_INFO идёт после него.
+    """
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    environ = header_environ(scope.get('headers', ()))
+    environ.update({
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path.encode().decode('latin-1'),
+        'PATH_INFO': path.encode().decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'CONTENT_LENGTH': str(len(body)),
+        'SERVER_NAME': str(server[0]),
+        'SERVER_PORT': str(server[1]),
+        'REMOTE_ADDR': client[0],
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    })
+    return environ
+
+
+class ASGIHandler:
+    """ASGI-приложение поверх синхронного обработчика Django.
+
+    В Django 2.2 нет async view, поэтому middleware и view выполняются
+    в пуле из ASGI_THREADS потоков, а чтение запроса и отправка ответа
+    идут в цикле событий. Медленный клиент не держит поток с
+    соединением к базе, а одновременных запросов к SQLite не больше,
+    чем потоков в пуле.
+    """
+
+    def __init__(self, max_workers=None):
+        self.wsgi = WSGIHandler()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.ASGI_THREADS,
+            thread_name_prefix='asgi',
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self.http(scope, receive, send)
+        else:
+            raise ValueError(f'Тип соединения {scope["type"]} не поддержан.')
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def http(self, scope, receive, send):
+        try:
+            body = await read_body(receive)
+        except RequestBodyTooLarge:
+            await send({
+                'type': 'http.response.start',
+                'status': 413,
+                'headers': [(b'content-type', b'text/plain; charset=utf-8')],
+            })
+            await send({
+                'type': 'http.response.body',
+                'body': 'Слишком большой запрос.'.encode(),
+            })
+            return
+        if body is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        status, headers, content = await loop.run_in_executor(
+            self.executor,
+            copy_context().run,
+            self.get_response,
+            build_environ(scope, body),
+        )
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': headers,
+        })
+        await send({'type': 'http.response.body', 'body': content})
+
+    def get_response(self, environ):
+        """Выполняет запрос в потоке пула и читает ответ целиком.
+
+        Итератор ответа закрывается здесь же: request_finished и
+        закрытие соединений с базой должны произойти в этом потоке.
+        """
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in headers
+            ]
+
+        result = self.wsgi(environ, start_response)
+        try:
+            content = b''.join(result)
+        finally:
+            result.close()
+        return started['status'], started['headers'], content
+
+
+def get_asgi_application():
+    """Аналог get_wsgi_application для ASGI-серверов."""
+    django.setup(set_prefix=False)
+    return ASGIHandler()
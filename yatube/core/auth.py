@@ -0,0 +1,16 @@
+from django.conf import settings
+
+
+def has_session_cookie(request):
+    return settings.SESSION_COOKIE_NAME in request.COOKIES
+
+
+def is_anonymous_request(request):
+    """Проверяет анонимность, по возможности не трогая сессию.
+
+    Без cookie сессии пользователь точно анонимный, и ни сессия, ни
+    request.user не загружаются. Иначе решает request.user.
+    """
+    if not has_session_cookie(request):
+        return True
+    return not request.user.is_authenticated
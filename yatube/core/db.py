@@ -0,0 +1,89 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+from .auth import has_session_cookie
+
+PIN_PRIMARY_SESSION_KEY = 'pin_primary_until'
+
+_read_database = ContextVar('read_database', default=None)
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Выполняет SQLITE_PRAGMAS для каждого нового соединения SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def pin_primary(request):
+    """Отправляет чтения пользователя на primary после его записи."""
+    request.session[PIN_PRIMARY_SESSION_KEY] = (
+        time.time() + settings.REPLICA_PIN_SECONDS
+    )
+
+
+def is_pinned_to_primary(request):
+    if not has_session_cookie(request):
+        return False
+    return request.session.get(PIN_PRIMARY_SESSION_KEY, 0) > time.time()
+
+
+def read_from_replica(view):
+    """Выполняет чтения view на случайной реплике из DATABASE_REPLICAS.
+
+    Пользователь, недавно писавший в базу, читает с primary, чтобы
+    сразу увидеть свою запись.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or is_pinned_to_primary(request):
+            return view(request, *args, **kwargs)
+
+        token = _read_database.set(random.choice(replicas))
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_database.reset(token)
+
+    return wrapper
+
+
+def reads_from_replica():
+    """Читает ли текущий запрос с реплики."""
+    return _read_database.get() is not None
+
+
+@contextmanager
+def use_primary():
+    """Чтения внутри блока идут на primary, даже в read_from_replica."""
+    token = _read_database.set(None)
+    try:
+        yield
+    finally:
+        _read_database.reset(token)
+
+
+class ReplicaRouter:
+    """Направляет чтения внутри read_from_replica на реплику."""
+
+    def db_for_read(self, model, **hints):
+        return _read_database.get() or 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,147 @@
+import random
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import Template
+
+METRICS = ('sql_count', 'sql_ms', 'template_ms', 'total_ms', 'bytes')
+
+_current_profile = ContextVar('request_profile', default=None)
+_histograms = {}
+_histograms_lock = threading.Lock()
+
+
+class RequestProfile:
+    """Метрики одного запроса."""
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.render_depth = 0
+
+    def execute(self, execute, sql, params, many, context):
+        """execute_wrapper: считает запросы и время в базе."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_count += 1
+            self.sql_time += time.perf_counter() - started
+
+
+def _profiled_render(render):
+    """Оборачивает Template.render, чтобы учитывать время шаблонов.
+
+    Время считается только для внешнего рендера: вложенные вызовы уже
+    входят в него. Запросы, выполненные ленивыми QuerySet во время
+    рендера, из времени шаблона вычитаются: они уже посчитаны как SQL.
+    """
+    def wrapper(self, *args, **kwargs):
+        profile = _current_profile.get()
+        if profile is None or profile.render_depth:
+            return render(self, *args, **kwargs)
+
+        profile.render_depth += 1
+        started = time.perf_counter()
+        sql_time = profile.sql_time
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            profile.template_time += elapsed - (profile.sql_time - sql_time)
+            profile.render_depth -= 1
+
+    wrapper.profiled = True
+    return wrapper
+
+
+if not getattr(Template.render, 'profiled', False):
+    Template.render = _profiled_render(Template.render)
+
+
+def record(view_name, sample):
+    """Добавляет замер в скользящее окно view."""
+    window = getattr(settings, 'REQUEST_PROFILING_WINDOW', 1000)
+    with _histograms_lock:
+        histogram = _histograms.get(view_name)
+        if histogram is None or histogram.maxlen != window:
+            histogram = _histograms[view_name] = deque(
+                histogram or (), maxlen=window
+            )
+        histogram.append(sample)
+
+
+def get_stats(percentiles=(50, 95, 99)):
+    """Перцентили метрик по каждому view за скользящее окно."""
+    with _histograms_lock:
+        samples = {name: list(window) for name, window in _histograms.items()}
+
+    stats = {}
+    for name, window in samples.items():
+        stats[name] = {'requests': len(window)}
+        for metric in METRICS:
+            values = sorted(sample[metric] for sample in window)
+            for rank in percentiles:
+                index = max(0, -(-len(values) * rank // 100) - 1)
+                stats[name][f'{metric}_p{rank}'] = values[index]
+    return stats
+
+
+def reset_stats():
+    with _histograms_lock:
+        _histograms.clear()
+
+
+class RequestProfilingMiddleware:
+    """Профилирует выборку запросов: SQL, шаблоны и размер ответа.
+
+    Доля профилируемых запросов задаётся REQUEST_PROFILING_SAMPLE_RATE,
+    остальные запросы проходят без накладных расходов. Метрики
+    отдаются в заголовке Server-Timing и копятся в скользящем окне
+    по имени view.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = getattr(settings, 'REQUEST_PROFILING_SAMPLE_RATE', 0)
+        if rate <= 0 or random.random() >= rate:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(profile.execute)
+                    )
+                response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        total = time.perf_counter() - started
+
+        sample = {
+            'sql_count': profile.sql_count,
+            'sql_ms': round(profile.sql_time * 1000, 3),
+            'template_ms': round(profile.template_time * 1000, 3),
+            'total_ms': round(total * 1000, 3),
+            'bytes': 0 if response.streaming else len(response.content),
+        }
+        response['Server-Timing'] = ', '.join((
+            'sql;dur={sql_ms};desc="{sql_count} queries"'.format(**sample),
+            'tpl;dur={template_ms}'.format(**sample),
+            'total;dur={total_ms}'.format(**sample),
+        ))
+        match = request.resolver_match
+        record(match.view_name if match else 'unresolved', sample)
+
+        return response
@@ -0,0 +1,220 @@
+import asyncio
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import responses
+from urllib.parse import unquote
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+from django.core.wsgi import get_wsgi_application
+
+from .asgi import ASGIHandler
+
+# Сколько секунд серверы ждут медленного клиента, и размер очереди
+# соединений, которые ещё не приняты сервером.
+SLOW_CLIENT_TIMEOUT = 30
+SERVER_BACKLOG = 128
+
+
+class ConnectionTracker:
+    """Считает соединения, которые сервер обслуживает одновременно."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def __exit__(self, *exc_info):
+        with self.lock:
+            self.active -= 1
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    timeout = SLOW_CLIENT_TIMEOUT
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PooledWSGIServer(WSGIServer):
+    """WSGI-сервер, где соединение целиком обслуживает поток из пула.
+
+    Так работают синхронные воркеры с потоками: пока клиент медленно
+    отправляет запрос, поток занят и не берёт другие соединения.
+    """
+
+    request_queue_size = SERVER_BACKLOG
+
+    def __init__(self, threads):
+        super().__init__(('127.0.0.1', 0), QuietWSGIRequestHandler)
+        self.set_app(get_wsgi_application())
+        self.pool = ThreadPoolExecutor(threads, thread_name_prefix='wsgi')
+        self.tracker = ConnectionTracker()
+
+    @property
+    def address(self):
+        return self.server_address
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        with self.tracker:
+            try:
+                self.finish_request(request, client_address)
+            except OSError:
+                pass
+            finally:
+                self.shutdown_request(request)
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.shutdown()
+        self.pool.shutdown()
+        self.server_close()
+
+
+async def read_request(reader, writer):
+    """Читает запрос HTTP/1.x и возвращает scope ASGI и тело."""
+    request_line = await reader.readline()
+    method, target, version = request_line.decode('latin-1').split()
+    headers = []
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers.append((
+            name.strip().lower().encode('latin-1'),
+            value.strip().encode('latin-1'),
+        ))
+    length = int(dict(headers).get(b'content-length', b'0'))
+    body = await reader.readexactly(length)
+    path, _, query = target.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': version.split('/')[-1],
+        'method': method,
+        'scheme': 'http',
+        'path': unquote(path),
+        'raw_path': path.encode('latin-1'),
+        'query_string': query.encode('latin-1'),
+        'root_path': '',
+        'headers': headers,
+        'server': writer.get_extra_info('sockname')[:2],
+        'client': writer.get_extra_info('peername')[:2],
+    }
+    return scope, body
+
+
+class ASGIServer:
+    """Минимальный HTTP-сервер на asyncio для ASGIHandler.
+
+    Одно соединение — один запрос. Нужен только для сравнения в
+    бенчмарке; в работе yatube.asgi запускают uvicorn или daphne.
+    """
+
+    def __init__(self, threads):
+        self.app = ASGIHandler(max_workers=threads)
+        self.tracker = ConnectionTracker()
+        self.ready = threading.Event()
+
+    def start(self):
+        self.thread = threading.Thread(
+            target=asyncio.run, args=(self.serve(),), daemon=True
+        )
+        self.thread.start()
+        self.ready.wait()
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.stopped.set)
+        self.thread.join()
+        self.app.executor.shutdown()
+
+    async def serve(self):
+        self.loop = asyncio.get_running_loop()
+        self.stopped = asyncio.Event()
+        server = await asyncio.start_server(
+            self.handle, '127.0.0.1', 0, backlog=SERVER_BACKLOG
+        )
+        self.address = server.sockets[0].getsockname()[:2]
+        self.ready.set()
+        async with server:
+            await self.stopped.wait()
+
+    async def handle(self, reader, writer):
+        with self.tracker:
+            try:
+                scope, body = await asyncio.wait_for(
+                    read_request(reader, writer), SLOW_CLIENT_TIMEOUT
+                )
+                await self.app(
+                    scope, self.receiver(body), self.sender(writer)
+                )
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError,
+                    ConnectionError, ValueError):
+                pass
+            finally:
+                writer.close()
+
+    def receiver(self, body):
+        messages = [
+            {'type': 'http.request', 'body': body, 'more_body': False},
+        ]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            return {'type': 'http.disconnect'}
+
+        return receive
+
+    def sender(self, writer):
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                lines = [f'HTTP/1.0 {status} {responses.get(status, "")}']
+                lines += [
+                    f'{name.decode("latin-1")}: {value.decode("latin-1")}'
+                    for name, value in message['headers']
+                ]
+                writer.write(
+                    ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+                )
+            else:
+                writer.write(message.get('body', b''))
+                await writer.drain()
+
+        return send
+
+
+def http_get(address, path, delay=0):
+    """GET через сокет; с delay запрос отправляется по байту.
+
+    Возвращает код ответа.
+    """
+    request = f'GET {path} HTTP/1.0\r\nHost: localhost\r\n\r\n'.encode()
+    with socket.create_connection(
+        address, timeout=SLOW_CLIENT_TIMEOUT
+    ) as sock:
+        if delay:
+            for byte in request:
+                sock.sendall(bytes((byte,)))
+                time.sleep(delay)
+        else:
+            sock.sendall(request)
+        chunks = []
+        chunk = sock.recv(65536)
+        while chunk:
+            chunks.append(chunk)
+            chunk = sock.recv(65536)
+    return int(b''.join(chunks).split(b' ', 2)[1])
@@ -0,0 +1,33 @@
+import os
+
+from django.conf import settings
+from django.template import engines
+from django.template.utils import get_app_template_dirs
+
+
+def iter_template_names(directories):
+    """Имена всех HTML-шаблонов в каталогах directories."""
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.endswith('.html'):
+                    path = os.path.join(root, name)
+                    yield os.path.relpath(path, directory).replace(
+                        os.sep, '/'
+                    )
+
+
+def warm_up_templates():
+    """Компилирует шаблоны проекта заранее, заполняя cached.Loader."""
+    engine = engines['django']
+    directories = list(engine.engine.dirs)
+    directories += get_app_template_dirs('templates')
+    names = sorted(set(iter_template_names(directories)))
+    for name in names:
+        engine.get_template(name)
+    return names
+
+
+def warm_up_if_cached():
+    if getattr(settings, 'CACHED_TEMPLATES', False):
+        warm_up_templates()
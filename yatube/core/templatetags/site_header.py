@@ -0,0 +1,33 @@
+from functools import lru_cache
+
+from django import template
+from django.contrib.auth.models import AnonymousUser
+from django.template.loader import render_to_string
+
+from core.auth import is_anonymous_request
+
+register = template.Library()
+
+HEADER_TEMPLATE = 'includes/header.html'
+
+
+@lru_cache(maxsize=None)
+def anonymous_header(view_name):
+    """Шапка для анонимного пользователя, отрисованная один раз на view."""
+    return render_to_string(
+        HEADER_TEMPLATE, {'user': AnonymousUser(), 'view_name': view_name}
+    )
+
+
+@register.simple_tag(takes_context=True)
+def site_header(context):
+    """Шапка сайта; сессия и пользователь трогаются только при входе."""
+    request = context.get('request')
+    match = getattr(request, 'resolver_match', None)
+    view_name = match.view_name if match else ''
+    if request is None or is_anonymous_request(request):
+        return anonymous_header(view_name)
+
+    return render_to_string(
+        HEADER_TEMPLATE, {'user': context['user'], 'view_name': view_name}
+    )
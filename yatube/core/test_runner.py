@@ -0,0 +1,19 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """Запускает тесты без фонового воркера outbox.
+
+    Тесты выполняют задачи сами через run_jobs, а поток воркера
+    включают только там, где проверяют его самого.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.jobs_override = override_settings(POST_JOBS_IN_PROCESS=False)
+        self.jobs_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.jobs_override.disable()
+        super().teardown_test_environment(**kwargs)
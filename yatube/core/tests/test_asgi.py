@@ -0,0 +1,124 @@
+import asyncio
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from ..asgi import ASGIHandler, build_environ
+
+
+class ASGIHandlerTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.app = ASGIHandler(max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.app.executor.shutdown()
+        super().tearDownClass()
+
+    def call(self, scope, messages):
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(self.app(scope, receive, send))
+        return sent
+
+    def get(self, path, **scope):
+        scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': path,
+            'query_string': b'',
+            'headers': [(b'host', b'testserver')],
+            **scope,
+        }
+        return self.call(scope, [{'type': 'http.request', 'body': b''}])
+
+    def test_serves_django_views(self):
+        """Запрос ASGI выполняется обработчиком Django в пуле потоков."""
+        start, body = self.get(reverse('about:author'))
+        self.assertEqual(start['type'], 'http.response.start')
+        self.assertEqual(start['status'], 200)
+        self.assertIn(
+            (b'content-type', b'text/html; charset=utf-8'), start['headers']
+        )
+        self.assertEqual(body['type'], 'http.response.body')
+        self.assertIn('<html'.encode(), body['body'])
+        start, body = self.get('/missing-page/')
+        self.assertEqual(start['status'], 404)
+
+    def test_disconnect_before_body_skips_response(self):
+        """Если клиент отключился до конца тела, ответа нет."""
+        scope = {'type': 'http', 'method': 'POST', 'path': '/'}
+        sent = self.call(scope, [
+            {'type': 'http.request', 'body': b'a', 'more_body': True},
+            {'type': 'http.disconnect'},
+        ])
+        self.assertEqual(sent, [])
+
+    @override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=4)
+    def test_large_body_rejected(self):
+        """Тело больше DATA_UPLOAD_MAX_MEMORY_SIZE не читается до конца."""
+        scope = {'type': 'http', 'method': 'POST', 'path': '/'}
+        start, body = self.call(scope, [
+            {'type': 'http.request', 'body': b'abc', 'more_body': True},
+            {'type': 'http.request', 'body': b'de', 'more_body': True},
+        ])
+        self.assertEqual(start['status'], 413)
+
+    def test_root_path_moves_to_script_name(self):
+        """Префикс root_path уходит из PATH_INFO в SCRIPT_NAME."""
+        environ = build_environ({
+            'method': 'GET',
+            'path': '/yatube/about/author/',
+            'root_path': '/yatube',
+        }, b'')
+        self.assertEqual(environ['SCRIPT_NAME'], '/yatube')
+        self.assertEqual(environ['PATH_INFO'], '/about/author/')
+
+    def test_lifespan(self):
+        """Приложение отвечает на события запуска и остановки."""
+        app = ASGIHandler(max_workers=1)
+        sent = []
+
+        async def receive():
+            return {'type': f'lifespan.{events.pop(0)}'}
+
+        async def send(message):
+            sent.append(message['type'])
+
+        events = ['startup', 'shutdown']
+        asyncio.run(app({'type': 'lifespan'}, receive, send))
+        self.assertEqual(sent, [
+            'lifespan.startup.complete', 'lifespan.shutdown.complete',
+        ])
+
+    def test_build_environ(self):
+        """scope ASGI переводится в окружение WSGI."""
+        environ = build_environ({
+            'method': 'POST',
+            'path': '/группа/',
+            'query_string': b'page=2',
+            'headers': [
+                (b'content-type', b'text/plain'),
+                (b'cookie', b'a=1'),
+                (b'cookie', b'b=2'),
+                (b'x-forwarded-for', b'10.0.0.1'),
+            ],
+            'client': ('127.0.0.1', 5000),
+        }, b'body')
+        self.assertEqual(environ['PATH_INFO'].encode('latin-1').decode(),
+                         '/группа/')
+        self.assertEqual(environ['QUERY_STRING'], 'page=2')
+        self.assertEqual(environ['CONTENT_TYPE'], 'text/plain')
+        self.assertEqual(environ['CONTENT_LENGTH'], '4')
+        self.assertEqual(environ['HTTP_COOKIE'], 'a=1; b=2')
+        self.assertEqual(environ['HTTP_X_FORWARDED_FOR'], '10.0.0.1')
+        self.assertEqual(environ['REMOTE_ADDR'], '127.0.0.1')
+        self.assertEqual(environ['wsgi.input'].read(), b'body')
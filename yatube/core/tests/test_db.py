@@ -0,0 +1,22 @@
+from django.db import connection
+from django.test import TestCase
+
+
+class SqlitePragmasTests(TestCase):
+    def get_pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_connection_uses_tuned_pragmas(self):
+        """Новое соединение SQLite получает настройки SQLITE_PRAGMAS."""
+        connection.close()
+        pragmas = {
+            'synchronous': 1,
+            'busy_timeout': 5000,
+            'cache_size': -64000,
+            'temp_store': 2,
+        }
+        for name, expected in pragmas.items():
+            with self.subTest(pragma=name):
+                self.assertEqual(self.get_pragma(name), expected)
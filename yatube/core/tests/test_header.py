@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post, User
+
+
+class SiteHeaderTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='TestUser')
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(SiteHeaderTests.user)
+
+    def test_cookieless_request_skips_session(self):
+        """Запрос без cookie сессии не трогает сессию и пользователя.
+
+        Ответ public, но с Vary: Cookie, и одинаков при промахе и
+        попадании в кэш страниц.
+        """
+        post = Post.objects.create(author=self.user, text='Тестовый пост')
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:post_detail', args=(post.pk,)),
+        )
+        for url in urls:
+            for attempt in ('miss', 'hit'):
+                with self.subTest(url=url, attempt=attempt):
+                    response = self.client.get(url)
+                    self.assertFalse(response.wsgi_request.session.accessed)
+                    self.assertIn('Cookie', response['Vary'])
+                    self.assertIn('public', response['Cache-Control'])
+                    self.assertContains(response, reverse('users:login'))
+                    self.assertNotContains(response, 'Редактировать запись')
+
+    def test_author_sees_edit_link(self):
+        """Автору поста на его странице показывается ссылка на правку."""
+        post = Post.objects.create(author=self.user, text='Тестовый пост')
+        response = self.authorized_client.get(
+            reverse('posts:post_detail', args=(post.pk,))
+        )
+        self.assertContains(response, 'Редактировать запись')
+
+    def test_authorized_header_is_personal(self):
+        """Вошедший пользователь получает свою шапку и private-ответ."""
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertContains(response, f'Пользователь: {self.user}')
+        self.assertIn('Cookie', response['Vary'])
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_header_marks_active_view(self):
+        """Активный пункт меню отмечается и в анонимной шапке."""
+        response = self.client.get(reverse('about:author'))
+        self.assertContains(response, 'nav-link active', count=1)
@@ -0,0 +1,75 @@
+from itertools import count
+from unittest import mock
+
+from django.template import engines
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+from ..middleware.profiling import (
+    RequestProfile, _current_profile, get_stats, reset_stats,
+)
+
+
+@override_settings(REQUEST_PROFILING_SAMPLE_RATE=1)
+class RequestProfilingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestAuthor')
+        Post.objects.create(author=cls.author, text='Тестовый пост')
+
+    def setUp(self):
+        reset_stats()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(
+            RequestProfilingMiddlewareTests.author
+        )
+
+    def test_server_timing_header(self):
+        """Ответ содержит SQL- и шаблонные метрики в Server-Timing."""
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^sql;dur=[\d.]+;desc="\d+ queries", '
+            r'tpl;dur=[\d.]+, total;dur=[\d.]+$',
+        )
+
+    def test_stats_grouped_by_view_name(self):
+        """Замеры копятся по имени view."""
+        for _ in range(3):
+            response = self.authorized_client.get(reverse('posts:index'))
+        self.authorized_client.get(reverse('about:author'))
+        stats = get_stats()
+        self.assertEqual(stats['posts:index']['requests'], 3)
+        self.assertEqual(stats['about:author']['requests'], 1)
+        self.assertGreater(stats['posts:index']['sql_count_p50'], 0)
+        self.assertGreater(stats['posts:index']['template_ms_p99'], 0)
+        self.assertEqual(
+            stats['posts:index']['bytes_p50'], len(response.content)
+        )
+
+    @override_settings(REQUEST_PROFILING_SAMPLE_RATE=0)
+    def test_sampling_disabled(self):
+        """При нулевой доле выборки запрос не профилируется."""
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertEqual(get_stats(), {})
+
+    def test_nested_render_counted_once(self):
+        """Вложенный рендер шаблона не добавляет время второй раз."""
+        engine = engines['django']
+        inner = engine.from_string('внутренний')
+        outer = engine.from_string('{{ inner }}')
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            with mock.patch(
+                'core.middleware.profiling.time.perf_counter',
+                side_effect=count(),
+            ):
+                content = outer.render({'inner': lambda: inner.render()})
+        finally:
+            _current_profile.reset(token)
+        self.assertEqual(content, 'внутренний')
+        self.assertEqual(profile.template_time, 1)
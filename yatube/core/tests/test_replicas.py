@@ -0,0 +1,95 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.test.client import RequestFactory
+from django.urls import reverse
+
+from posts.models import Post, User
+from ..db import (
+    PIN_PRIMARY_SESSION_KEY,
+    ReplicaRouter,
+    is_pinned_to_primary,
+    read_from_replica,
+)
+from .utils import REPLICA, replicate
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRouterTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestAuthor')
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.authorized_client_author = Client()
+        self.authorized_client_author.force_login(ReplicaRouterTests.author)
+
+    def make_request(self, session):
+        request = RequestFactory().get('/')
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = 'session-key'
+        request.session = session
+        return request
+
+    def read_database(self, request):
+        @read_from_replica
+        def view(request):
+            return self.router.db_for_read(Post)
+
+        return view(request)
+
+    def test_read_only_views_use_replica(self):
+        """Внутри read_from_replica чтения идут на реплику."""
+        self.assertEqual(self.read_database(self.make_request({})), 'replica')
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+        self.assertEqual(self.router.db_for_write(Post), 'default')
+        self.assertFalse(self.router.allow_migrate('replica', 'posts'))
+
+    def test_recent_writer_reads_primary(self):
+        """Недавно писавший пользователь читает с primary."""
+        request = self.make_request(
+            {PIN_PRIMARY_SESSION_KEY: time.time() + 10}
+        )
+        self.assertEqual(self.read_database(request), 'default')
+        request.session[PIN_PRIMARY_SESSION_KEY] = time.time() - 1
+        self.assertEqual(self.read_database(request), 'replica')
+
+    def test_post_create_pins_session(self):
+        """После создания поста сессия закреплена за primary."""
+        self.authorized_client_author.post(
+            reverse('posts:post_create'), data={'text': 'Новый пост'}
+        )
+        request = self.make_request(self.authorized_client_author.session)
+        self.assertTrue(is_pinned_to_primary(request))
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaViewTests(TestCase):
+    databases = {'default', REPLICA}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.reader = User.objects.create_user(username='TestReader')
+        replicate(User)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(ReplicaViewTests.reader)
+
+    def test_lagging_replica_page_not_cached(self):
+        """Страница с отстающей реплики не попадает в кэш и в ETag."""
+        Post.objects.create(author=self.author, text='Свежий пост')
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertNotContains(response, 'Свежий пост')
+        self.assertFalse(response.has_header('ETag'))
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'Свежий пост')
+        replicate(Post)
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Свежий пост')
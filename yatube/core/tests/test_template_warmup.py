@@ -0,0 +1,15 @@
+from django.test import SimpleTestCase
+
+from ..template_warmup import warm_up_templates
+
+
+class TemplateWarmupTests(SimpleTestCase):
+    def test_warm_up_compiles_project_templates(self):
+        """Прогрев компилирует шаблоны проекта и приложений."""
+        names = warm_up_templates()
+        for name in (
+            'base.html', 'includes/header.html', 'posts/index.html',
+            'posts/includes/paginator.html', 'users/login.html',
+        ):
+            with self.subTest(name=name):
+                self.assertIn(name, names)
@@ -0,0 +1,27 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA = 'replica'
+
+# Отдельная база SQLite для тестов реплик. В отличие от TEST.MIRROR,
+# она не видит записей primary, пока их не скопирует replicate: так
+# проверяется отставание реплики. Тесты подключают её через
+# databases = {'default', REPLICA}.
+connections.databases.setdefault(REPLICA, {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': ':memory:',
+})
+
+
+def replicate(*models):
+    """Реплика догоняет primary: копирует ей новые строки моделей."""
+    for model in models:
+        manager = model._base_manager
+        known = set(manager.using(REPLICA).values_list('pk', flat=True))
+        rows = [
+            obj for obj in manager.using(DEFAULT_DB_ALIAS).order_by('pk')
+            if obj.pk not in known
+        ]
+        if rows:
+            manager._insert(
+                rows, fields=model._meta.local_concrete_fields, using=REPLICA
+            )
@@ -1,6 +1,53 @@
+from functools import lru_cache
+
+from django import forms
 from django.contrib import admin
+from django.forms.utils import flatatt
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 
+from .cache import get_group_choices
+from .feeds import ADMIN_CHANGELIST_FIELDS
+from .forms import use_cached_group_choices
 from .models import Post, Group
+from .search import build_match_query, matching_ids
+from .utils import EstimatedCountPaginator
+
+
+@lru_cache(maxsize=16)
+def render_options(choices):
+    """HTML вариантов выбора и их позиции по значению."""
+    options = [
+        format_html('<option value="{}">{}</option>', value, label)
+        for value, label in choices
+    ]
+    positions = {str(value): index for index, (value, _) in enumerate(choices)}
+    return options, positions
+
+
+class SharedChoicesSelect(forms.Select):
+    """Select, который рендерит варианты один раз на все строки списка.
+
+    Стандартный Select прогоняет шаблон на каждый option каждой строки;
+    здесь готовый HTML вариантов берётся из кэша, а в строке только
+    отмечается выбранное значение.
+    """
+
+    def render(self, name, value, attrs=None, renderer=None):
+        choices = tuple(self.choices)
+        options, positions = render_options(choices)
+        selected = positions.get('' if value is None else str(value))
+        if selected is not None:
+            options = list(options)
+            options[selected] = format_html(
+                '<option value="{}" selected>{}</option>', *choices[selected]
+            )
+        return format_html(
+            '<select name="{}"{}>{}</select>',
+            name,
+            flatatt(self.build_attrs(self.attrs, attrs)),
+            mark_safe(''.join(options)),
+        )
 
 
 @admin.register(Post)
@@ -17,6 +64,52 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ('text',)
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
+    date_hierarchy = 'pub_date'
+    raw_id_fields = ('author',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_select_related = ('author', 'group')
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        """Список групп берётся из кэша один раз на все строки списка."""
+        if db_field.name == 'group':
+            kwargs['widget'] = SharedChoicesSelect
+        formfield = super().formfield_for_foreignkey(
+            db_field, request, **kwargs
+        )
+        if db_field.name == 'group':
+            use_cached_group_choices(formfield)
+            formfield.choices = [
+                ('', formfield.empty_label), *get_group_choices()
+            ]
+        return formfield
+
+    def get_list_display(self, request):
+        """Вместо полного текста список выводит его готовый заголовок."""
+        return tuple(
+            'text_title' if name == 'text' else name
+            for name in super().get_list_display(request)
+        )
+
+    def text_title(self, obj):
+        return obj.title
+    text_title.short_description = 'Текст поста'
+    text_title.admin_order_field = 'text'
+
+    def get_queryset(self, request):
+        """В списке постов вместо полного текста читается его заголовок."""
+        queryset = super().get_queryset(request)
+        if request.resolver_match.url_name == 'posts_post_changelist':
+            queryset = queryset.only(*ADMIN_CHANGELIST_FIELDS)
+        return queryset
+
+    def get_search_results(self, request, queryset, search_term):
+        """Поиск по тексту через индекс FTS5 вместо LIKE '%term%'."""
+        match_query = build_match_query(search_term)
+        if not match_query:
+            return queryset, False
+
+        return queryset.filter(pk__in=matching_ids(match_query)), False
 
 
 @admin.register(Group)
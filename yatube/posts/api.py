@@ -0,0 +1,264 @@
+import json
+from operator import itemgetter
+
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST, require_safe
+
+from core.db import read_from_replica
+from users.tokens import TOKEN_KEYWORD, get_token_user
+
+from .cache import (
+    group_posts_scopes,
+    index_scopes,
+    post_detail_scopes,
+    profile_scopes,
+)
+from .conditional import conditional_page
+from .constants import API_BATCH_SIZE, API_PAGE_LIMIT, POSTS_PAGE
+from .forms import PostForm
+from .models import Group, Post, User
+from .utils import CursorPaginator, decode_cursor
+
+# Поля, которые можно запросить через ?fields=, и их столбцы. JOIN с
+# автором или группой делается, только если запрошено их поле.
+API_FIELDS = {
+    'id': 'id',
+    'pub_date': 'pub_date',
+    'title': 'title',
+    'text': 'text',
+    'text_html': 'text_html',
+    'excerpt_html': 'excerpt_html',
+    'author': 'author__username',
+    'group': 'group__slug',
+}
+API_DEFAULT_FIELDS = ('id', 'pub_date', 'author', 'group', 'text')
+# Столбцы курсора читаются всегда, даже если их нет в ?fields=, и
+# идут первыми в строке values_list.
+CURSOR_FIELDS = ('pub_date', 'id')
+row_key = itemgetter(*range(len(CURSOR_FIELDS)))
+JSON_PARAMS = {'ensure_ascii': False, 'separators': (',', ':')}
+# Допустимые типы полей поста в JSON. PostForm сама приводит число к
+# тексту и строку к id группы, поэтому типы проверяются до неё.
+POST_FIELD_TYPES = {
+    'text': (str,),
+    'group': (int, type(None)),
+}
+
+
+def json_response(data, status=200):
+    return JsonResponse(data, status=status, json_dumps_params=JSON_PARAMS)
+
+
+def json_error(message, status):
+    return json_response({'detail': message}, status=status)
+
+
+def parse_fields(request):
+    """Имена полей из ?fields=; при неизвестном поле ValueError."""
+    raw = request.GET.get('fields')
+    if not raw:
+        return API_DEFAULT_FIELDS
+    names = tuple(dict.fromkeys(
+        name.strip() for name in raw.split(',') if name.strip()
+    ))
+    unknown = [name for name in names if name not in API_FIELDS]
+    if unknown or not names:
+        raise ValueError(
+            f'Неизвестные поля: {", ".join(unknown)}. '
+            f'Доступны: {", ".join(API_FIELDS)}.'
+        )
+    return names
+
+
+def parse_limit(request):
+    limit = request.GET.get('limit', str(POSTS_PAGE))
+    if not limit.isdigit() or not 1 <= int(limit) <= API_PAGE_LIMIT:
+        raise ValueError(f'limit должен быть от 1 до {API_PAGE_LIMIT}.')
+    return int(limit)
+
+
+def get_columns(names):
+    return list(dict.fromkeys(
+        (*CURSOR_FIELDS, *(API_FIELDS[name] for name in names))
+    ))
+
+
+def serialize(rows, columns, names):
+    """Кортежи values_list в словари с полями names.
+
+    Экземпляры моделей не создаются: строки базы сразу идут в JSON.
+    """
+    positions = [columns.index(API_FIELDS[name]) for name in names]
+    return [
+        {name: row[position] for name, position in zip(names, positions)}
+        for row in rows
+    ]
+
+
+def feed_response(request, posts):
+    """Страница ленты в JSON с курсором на следующую страницу.
+
+    Курсор — дата и id последнего поста страницы: следующая страница
+    читается по индексу ленты с этого места, без OFFSET.
+    """
+    try:
+        names = parse_fields(request)
+        limit = parse_limit(request)
+        cursor = request.GET.get('cursor')
+        if cursor and decode_cursor(cursor) is None:
+            raise ValueError('Неверный cursor.')
+    except ValueError as error:
+        return json_error(str(error), 400)
+
+    columns = get_columns(names)
+    paginator = CursorPaginator(
+        posts.values_list(*columns), limit, key=row_key
+    )
+    page = paginator.cursor_page(after=cursor)
+    next_url = None
+    if page.has_next():
+        query = request.GET.copy()
+        query['cursor'] = page.next_cursor
+        next_url = f'{request.path}?{query.urlencode()}'
+
+    return json_response({
+        'results': serialize(page.object_list, columns, names),
+        'next': next_url,
+    })
+
+
+@require_safe
+@read_from_replica
+@conditional_page(index_scopes)
+def index(request):
+    """JSON-вариант posts:index."""
+    return feed_response(request, Post.objects.all())
+
+
+@require_safe
+@read_from_replica
+@conditional_page(group_posts_scopes)
+def group_posts(request, slug):
+    """JSON-вариант posts:group_list."""
+    group_id = (
+        Group.objects.filter(slug=slug).values_list('pk', flat=True).first()
+    )
+    if group_id is None:
+        return json_error('Группа не найдена.', 404)
+
+    return feed_response(request, Post.objects.filter(group_id=group_id))
+
+
+@require_safe
+@read_from_replica
+@conditional_page(profile_scopes)
+def profile(request, username):
+    """JSON-вариант posts:profile."""
+    author_id = (
+        User.objects.filter(username=username)
+        .values_list('pk', flat=True).first()
+    )
+    if author_id is None:
+        return json_error('Автор не найден.', 404)
+
+    return feed_response(request, Post.objects.filter(author_id=author_id))
+
+
+@require_safe
+@read_from_replica
+@conditional_page(post_detail_scopes)
+def post_detail(request, post_id):
+    """JSON-вариант posts:post_detail."""
+    try:
+        names = parse_fields(request)
+    except ValueError as error:
+        return json_error(str(error), 400)
+
+    columns = get_columns(names)
+    row = Post.objects.filter(pk=post_id).values_list(*columns).first()
+    if row is None:
+        return json_error('Пост не найден.', 404)
+
+    return json_response(serialize((row,), columns, names)[0])
+
+
+def read_batch(request):
+    """Список постов из тела {"posts": [...]} или None, если тело неверное."""
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return None
+    posts = data.get('posts') if isinstance(data, dict) else None
+    if not isinstance(posts, list) or not 1 <= len(posts) <= API_BATCH_SIZE:
+        return None
+    return posts
+
+
+def check_post_types(data):
+    """Ошибки полей с неверным типом в формате form.errors."""
+    return {
+        field: [{'message': 'Неверный тип значения.', 'code': 'invalid_type'}]
+        for field, types in POST_FIELD_TYPES.items()
+        if field in data and (
+            not isinstance(data[field], types)
+            or isinstance(data[field], bool)
+        )
+    }
+
+
+def build_posts(posts_data, author):
+    """Проверяет типы полей и посты правилами PostForm.
+
+    Возвращает несохранённые посты и ошибки по номерам постов в пачке.
+    """
+    posts = []
+    errors = {}
+    for index, data in enumerate(posts_data):
+        if not isinstance(data, dict):
+            data = {}
+        type_errors = check_post_types(data)
+        if type_errors:
+            errors[index] = type_errors
+            continue
+        form = PostForm(data)
+        if not form.is_valid():
+            errors[index] = form.errors.get_json_data()
+            continue
+        post = form.save(commit=False)
+        post.author = author
+        posts.append(post)
+    return posts, errors
+
+
+@csrf_exempt
+@require_POST
+def post_batch_create(request):
+    """Создаёт пачку постов владельца токена одним bulk_create.
+
+    Если хотя бы один пост не прошёл проверку, не создаётся ни один,
+    а в ответе приходят ошибки по номерам постов.
+    """
+    author = get_token_user(request)
+    if author is None:
+        response = json_error(
+            f'Нужен заголовок Authorization: {TOKEN_KEYWORD} <ключ>.', 401
+        )
+        response['WWW-Authenticate'] = TOKEN_KEYWORD
+        return response
+
+    posts_data = read_batch(request)
+    if posts_data is None:
+        return json_error(
+            f'Ожидается JSON {{"posts": [...]}} с 1–{API_BATCH_SIZE} '
+            'постами.',
+            400,
+        )
+
+    posts, errors = build_posts(posts_data, author)
+    if errors:
+        return json_response({'errors': errors}, status=400)
+
+    posts = Post.objects.bulk_create(posts)
+
+    return json_response({'ids': [post.pk for post in posts]}, status=201)
@@ -0,0 +1,470 @@
+import os
+import random
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.admin import site
+from django.contrib.auth.hashers import make_password
+from django.db import OperationalError, connection
+from django.template.loader import get_template
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from faker import Faker
+
+from core.servers import ASGIServer, PooledWSGIServer, http_get
+from core.template_warmup import iter_template_names
+
+from .constants import POSTS_PAGE
+from .exchange import batched, preserved_post_dates
+from .forms import PostForm
+from .feeds import get_feed
+from .models import Group, Post, User
+from .utils import EstimatedCountPaginator, WindowedPaginator
+
+PERCENTILES = (50, 95, 99)
+ADMIN_USERNAME = 'bench_admin'
+
+
+def skewed_weights(size, skew):
+    """Веса по закону Ципфа: первые элементы встречаются чаще."""
+    return [1 / (rank + 1) ** skew for rank in range(size)]
+
+
+def seed(users, groups, posts, prefix='bench', skew=1.1, days=365,
+         batch_size=1000, random_seed=None):
+    """Создаёт пользователей, группы и посты с неравномерным распределением.
+
+    Авторы и группы выбираются по закону Ципфа, длина текста — по
+    логнормальному, даты публикации равномерно раскиданы по days дням.
+    """
+    rng = random.Random(random_seed)
+    faker = Faker('ru_RU')
+    faker.seed_instance(random_seed)
+    password = make_password(None)
+    User.objects.bulk_create(
+        (
+            User(
+                username=f'{prefix}_user_{i}',
+                first_name=faker.first_name(),
+                last_name=faker.last_name(),
+                password=password,
+            )
+            for i in range(users)
+        ),
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+    Group.objects.bulk_create(
+        (
+            Group(
+                title=faker.sentence(nb_words=3)[:-1],
+                slug=f'{prefix}-group-{i}',
+                description=faker.paragraph(),
+            )
+            for i in range(groups)
+        ),
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+    author_ids = list(
+        User.objects.filter(username__startswith=f'{prefix}_user_')
+        .order_by('pk').values_list('pk', flat=True)
+    )
+    group_ids = list(
+        Group.objects.filter(slug__startswith=f'{prefix}-group-')
+        .order_by('pk').values_list('pk', flat=True)
+    )
+    author_weights = skewed_weights(len(author_ids), skew)
+    group_weights = skewed_weights(len(group_ids), skew)
+    now = timezone.now()
+
+    def build_post():
+        group_id = None
+        if group_ids and rng.random() < 0.7:
+            group_id = rng.choices(group_ids, group_weights)[0]
+        pub_date = now - timedelta(seconds=rng.uniform(0, days * 86400))
+        sentences = max(1, int(rng.lognormvariate(1.2, 0.8)))
+        return Post(
+            text=faker.paragraph(nb_sentences=sentences),
+            author_id=rng.choices(author_ids, author_weights)[0],
+            group_id=group_id,
+            pub_date=pub_date,
+            updated=pub_date,
+        )
+
+    with preserved_post_dates():
+        for batch in batched(range(posts), batch_size):
+            Post.objects.bulk_create(build_post() for _ in batch)
+
+
+def percentile(values, rank):
+    """Перцентиль по методу ближайшего ранга."""
+    ordered = sorted(values)
+    index = max(0, -(-len(ordered) * rank // 100) - 1)
+    return ordered[index]
+
+
+def summarize(samples):
+    latencies = [sample['latency'] for sample in samples]
+    summary = {
+        f'p{rank}_ms': round(percentile(latencies, rank) * 1000, 3)
+        for rank in PERCENTILES
+    }
+    summary['queries'] = max(sample['queries'] for sample in samples)
+    summary['bytes'] = max(sample['bytes'] for sample in samples)
+    summary['requests'] = len(samples)
+    return summary
+
+
+class BenchmarkRunner:
+    """Прогоняет view Yatube через тестовый Client и собирает метрики."""
+
+    def __init__(self, requests, anonymous=False, random_seed=None):
+        self.requests = requests
+        self.rng = random.Random(random_seed)
+        self.client = Client()
+        self.author = (
+            User.objects.filter(posts__isnull=False).order_by('pk').first()
+        )
+        self.anonymous = anonymous
+        if not anonymous:
+            self.client.force_login(self.author)
+
+    def get_scenarios(self):
+        """Сценарии: имя view и функция, выполняющая один запрос."""
+        group = Group.objects.filter(posts_count__gt=0).order_by('pk').first()
+        post_ids = list(
+            Post.objects.filter(author=self.author)
+            .order_by('-pk').values_list('pk', flat=True)[:100]
+        )
+        scenarios = {
+            'posts:index': lambda: self.client.get(reverse('posts:index')),
+            'posts:profile': lambda: self.client.get(
+                reverse('posts:profile', args=(self.author.username,))
+            ),
+            'posts:post_detail': lambda: self.client.get(reverse(
+                'posts:post_detail', args=(self.rng.choice(post_ids),)
+            )),
+        }
+        scenarios.update({
+            'posts:api_index': lambda: self.client.get(
+                reverse('posts:api_index')
+            ),
+            'posts:api_profile': lambda: self.client.get(
+                reverse('posts:api_profile', args=(self.author.username,))
+            ),
+            'posts:api_post_detail': lambda: self.client.get(reverse(
+                'posts:api_post_detail', args=(self.rng.choice(post_ids),)
+            )),
+        })
+        if group is not None:
+            scenarios['posts:group_list'] = lambda: self.client.get(
+                reverse('posts:group_list', args=(group.slug,))
+            )
+            scenarios['posts:api_group_list'] = lambda: self.client.get(
+                reverse('posts:api_group_list', args=(group.slug,))
+            )
+        if not self.anonymous:
+            scenarios['posts:post_create'] = lambda: self.client.post(
+                reverse('posts:post_create'),
+                {'text': 'Пост из бенчмарка'},
+            )
+            scenarios['posts:post_edit'] = lambda: self.client.post(
+                reverse('posts:post_edit', args=(post_ids[0],)),
+                {'text': f'Правка из бенчмарка {time.time()}'},
+            )
+        return scenarios
+
+    def measure(self, make_request):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = make_request()
+            latency = time.perf_counter() - started
+        return {
+            'latency': latency,
+            'queries': len(queries),
+            'bytes': len(response.content),
+        }
+
+    def run(self):
+        results = {}
+        for name, make_request in self.get_scenarios().items():
+            samples = [
+                self.measure(make_request) for _ in range(self.requests)
+            ]
+            results[name] = summarize(samples)
+        return results
+
+
+class AdminBenchmark(BenchmarkRunner):
+    """Замеряет страницы админки постов от имени суперпользователя."""
+
+    def __init__(self, requests, random_seed=None):
+        self.requests = requests
+        self.rng = random.Random(random_seed)
+        self.client = Client()
+        admin, _ = User.objects.get_or_create(
+            username=ADMIN_USERNAME,
+            defaults={'is_staff': True, 'is_superuser': True},
+        )
+        self.client.force_login(admin)
+
+    def get_scenarios(self):
+        changelist = reverse('admin:posts_post_changelist')
+        post = Post.objects.order_by('-pk').first()
+        last_page = EstimatedCountPaginator(
+            Post.objects.order_by('pk'), site._registry[Post].list_per_page
+        ).num_pages - 1
+        scenarios = {
+            'admin:posts_post_changelist': lambda: self.client.get(
+                changelist
+            ),
+            'admin:posts_post_changelist:last_page': lambda: self.client.get(
+                changelist, {'p': last_page}
+            ),
+        }
+        if post is not None:
+            year = timezone.localtime(post.pub_date).year
+            scenarios['admin:posts_post_changelist:year'] = (
+                lambda: self.client.get(changelist, {'pub_date__year': year})
+            )
+            scenarios['admin:posts_post_change'] = lambda: self.client.get(
+                reverse('admin:posts_post_change', args=(post.pk,))
+            )
+        return scenarios
+
+
+def compare(results, baseline):
+    """Изменение p95 и числа запросов относительно прошлого прогона."""
+    diff = {}
+    for name, summary in results.items():
+        if name in baseline:
+            diff[name] = {
+                key: round(summary[key] - baseline[name][key], 3)
+                for key in ('p95_ms', 'queries', 'bytes')
+            }
+    return diff
+
+
+class ConcurrencyBenchmark:
+    """Читает ленту в несколько потоков, пока один поток пишет посты.
+
+    Каждый поток работает со своим соединением. Показывает, сколько
+    чтений успело пройти во время записи и как росла их задержка.
+    """
+
+    def __init__(self, readers, author):
+        self.readers = readers
+        self.author = author
+        self.stop = threading.Event()
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.counters = {'writes': 0, 'write_errors': 0, 'read_errors': 0}
+
+    def count(self, key):
+        with self.lock:
+            self.counters[key] += 1
+
+    def write(self):
+        try:
+            Post.objects.create(
+                author=self.author, text='Пост из бенчмарка записи'
+            )
+        except OperationalError:
+            self.count('write_errors')
+        else:
+            self.count('writes')
+
+    def read(self):
+        started = time.perf_counter()
+        try:
+            list(get_feed()[:POSTS_PAGE])
+        except OperationalError:
+            self.count('read_errors')
+            return
+        latency = time.perf_counter() - started
+        with self.lock:
+            self.latencies.append(latency)
+
+    def loop(self, action):
+        try:
+            while not self.stop.is_set():
+                action()
+        finally:
+            connection.close()
+
+    def run(self, duration):
+        threads = [threading.Thread(target=self.loop, args=(self.write,))]
+        threads += [
+            threading.Thread(target=self.loop, args=(self.read,))
+            for _ in range(self.readers)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        self.stop.set()
+        for thread in threads:
+            thread.join()
+        return self.report()
+
+    def report(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+        report = {'journal_mode': journal_mode, 'reads': len(self.latencies)}
+        report.update(self.counters)
+        if self.latencies:
+            for rank in PERCENTILES:
+                report[f'read_p{rank}_ms'] = round(
+                    percentile(self.latencies, rank) * 1000, 3
+                )
+            report['read_max_ms'] = round(max(self.latencies) * 1000, 3)
+        return report
+
+
+class TemplateBenchmark:
+    """Замеряет время рендера шаблонов posts с типичным контекстом.
+
+    Посты, автор и группа создаются в памяти, так что в замер
+    попадает только работа шаблонизатора (кроме списка групп в форме).
+    """
+
+    def __init__(self, iterations):
+        self.iterations = iterations
+
+    def get_template_names(self):
+        directory = os.path.join(settings.TEMPLATES_DIR, 'posts')
+        return sorted(
+            f'posts/{name}' for name in iter_template_names((directory,))
+        )
+
+    def get_context(self):
+        author = User(
+            pk=1, username='author', first_name='Лев', last_name='Толстой'
+        )
+        group = Group(
+            pk=1, title='Группа', slug='group', description='Описание группы'
+        )
+        text = 'Абзац текста поста.\n' * 20
+        posts = [
+            Post(pk=i, text=text, author=author, group=group,
+                 pub_date=timezone.now())
+            for i in range(1, POSTS_PAGE * 50 + 1)
+        ]
+        for post in posts:
+            post.render_text()
+        page_obj = WindowedPaginator(posts, POSTS_PAGE).get_page(25)
+        request = RequestFactory().get('/')
+        return request, {
+            'page_obj': page_obj,
+            'author': author,
+            'group': group,
+            'post': posts[0],
+            'posts_count': len(posts),
+            'form': PostForm(),
+            'query': 'текст',
+        }
+
+    def run(self):
+        request, context = self.get_context()
+        results = {}
+        for name in self.get_template_names():
+            template = get_template(name)
+            samples = []
+            for _ in range(self.iterations):
+                started = time.perf_counter()
+                content = template.render(context, request)
+                samples.append({
+                    'latency': time.perf_counter() - started,
+                    'queries': 0,
+                    'bytes': len(content.encode()),
+                })
+            summary = summarize(samples)
+            del summary['queries']
+            summary['renders'] = summary.pop('requests')
+            results[name] = summary
+        return results
+
+
+class SlowClientBenchmark:
+    """Сравнивает WSGI и ASGI под нагрузкой медленных клиентов.
+
+    Оба сервера выполняют Django в threads потоках. Медленные клиенты
+    отправляют запрос по байту с паузой delay, быстрые запрашивают ту
+    же страницу без пауз. Для быстрых считаются пропускная способность
+    и задержки, для сервера — сколько соединений он держал одновременно.
+    """
+
+    servers = {'wsgi': PooledWSGIServer, 'asgi': ASGIServer}
+
+    def __init__(self, path, threads, slow_clients, fast_clients, delay):
+        self.path = path
+        self.threads = threads
+        self.slow_clients = slow_clients
+        self.fast_clients = fast_clients
+        self.delay = delay
+
+    def run(self, duration):
+        return {
+            name: self.run_server(server_class(self.threads), duration)
+            for name, server_class in self.servers.items()
+        }
+
+    def run_server(self, server, duration):
+        server.start()
+        self.stop = threading.Event()
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.counters = {'slow_requests': 0, 'errors': 0}
+        clients = [
+            threading.Thread(target=self.loop, args=(server, self.delay))
+            for _ in range(self.slow_clients)
+        ]
+        clients += [
+            threading.Thread(target=self.loop, args=(server, 0))
+            for _ in range(self.fast_clients)
+        ]
+        for client in clients:
+            client.start()
+        time.sleep(duration)
+        self.stop.set()
+        for client in clients:
+            client.join()
+        server.stop()
+        return self.report(server, duration)
+
+    def loop(self, server, delay):
+        while not self.stop.is_set():
+            started = time.perf_counter()
+            try:
+                status = http_get(server.address, self.path, delay)
+            except (OSError, ValueError, IndexError):
+                status = None
+            latency = time.perf_counter() - started
+            with self.lock:
+                if status != 200:
+                    self.counters['errors'] += 1
+                elif delay:
+                    self.counters['slow_requests'] += 1
+                else:
+                    self.latencies.append(latency)
+
+    def report(self, server, duration):
+        report = {
+            'threads': self.threads,
+            'peak_connections': server.tracker.peak,
+            'fast_requests': len(self.latencies),
+            'throughput_rps': round(len(self.latencies) / duration, 1),
+        }
+        report.update(self.counters)
+        if self.latencies:
+            for rank in PERCENTILES:
+                report[f'p{rank}_ms'] = round(
+                    percentile(self.latencies, rank) * 1000, 3
+                )
+            report['max_ms'] = round(max(self.latencies) * 1000, 3)
+        return report
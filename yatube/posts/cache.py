@@ -0,0 +1,190 @@
+import hashlib
+from functools import wraps
+from http import HTTPStatus
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from core.auth import has_session_cookie, is_anonymous_request
+from core.db import use_primary
+
+from .constants import PAGE_CACHE_TIMEOUT, PUBLIC_CACHE_MAX_AGE
+from .models import Group, Post, User
+
+INDEX_SCOPE = 'index'
+GROUPS_SCOPE = 'groups'
+
+
+def group_scope(group_id):
+    return f'group:{group_id}'
+
+
+def author_scope(author_id):
+    return f'author:{author_id}'
+
+
+def post_scope(post_id):
+    return f'post:{post_id}'
+
+
+def version_key(scope):
+    return f'posts:version:{scope}'
+
+
+def get_versions(scopes):
+    """Текущие версии областей кэша; недостающие создаются."""
+    keys = [version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid4().hex, None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def bump_versions(scopes):
+    """Сбрасывает все страницы, закэшированные в областях scopes.
+
+    Версии меняются сразу и ещё раз после коммита: иначе параллельный
+    запрос успел бы закэшировать страницу по незакоммиченным данным.
+    """
+    def bump():
+        cache.set_many(
+            {version_key(scope): uuid4().hex for scope in scopes}, None
+        )
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def get_post_scopes(post):
+    """Области кэша, которые затрагивает сохранение или удаление поста."""
+    counted = getattr(post, '_counted_fields', {})
+    scopes = {
+        INDEX_SCOPE,
+        post_scope(post.pk),
+        author_scope(post.author_id),
+        author_scope(counted.get('author_id', post.author_id)),
+    }
+    for group_id in (post.group_id, counted.get('group_id')):
+        if group_id is not None:
+            scopes.add(group_scope(group_id))
+
+    return scopes
+
+
+def invalidate_posts(posts):
+    scopes = set()
+    for post in posts:
+        scopes.update(get_post_scopes(post))
+    bump_versions(scopes)
+
+
+def invalidate_group(group):
+    bump_versions((INDEX_SCOPE, GROUPS_SCOPE, group_scope(group.pk)))
+
+
+def get_group_choices():
+    """Пары (pk, название) всех групп для выпадающих списков.
+
+    Список кэшируется под версией GROUPS_SCOPE, поэтому сбрасывается
+    при сохранении и удалении любой группы.
+    """
+    version, = get_versions((GROUPS_SCOPE,))
+    key = f'posts:group-choices:{version}'
+    choices = cache.get(key)
+    if choices is None:
+        choices = list(
+            Group.objects.order_by('pk').values_list('pk', 'title')
+        )
+        cache.set(key, choices, PAGE_CACHE_TIMEOUT)
+    return choices
+
+
+def get_request_scopes(request, get_scopes, *args, **kwargs):
+    """Области кэша страницы, вычисленные один раз на запрос."""
+    if not hasattr(request, '_page_scopes'):
+        request._page_scopes = get_scopes(*args, **kwargs)
+    return request._page_scopes
+
+
+def page_cache_key(request, scopes):
+    versions = get_versions(scopes)
+    raw = '|'.join([request.get_full_path(), *versions])
+    return 'posts:page:' + hashlib.md5(raw.encode()).hexdigest()
+
+
+def cache_anonymous_page(get_scopes):
+    """Кэширует страницу для анонимных GET-запросов.
+
+    get_scopes получает аргументы view и возвращает области кэша,
+    от версий которых зависит страница. Ответ без cookie сессии
+    помечается как public с Vary: Cookie: прокси отдаст его только
+    запросам без cookie, а не вошедшим пользователям. Остальные ответы
+    private. Промах кэша рендерится по primary: страница с отстающей
+    реплики осталась бы в кэше под уже новыми версиями.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or not is_anonymous_request(request):
+                response = view(request, *args, **kwargs)
+                patch_cache_control(response, private=True)
+                return response
+
+            scopes = get_request_scopes(request, get_scopes, *args, **kwargs)
+            key = page_cache_key(request, scopes)
+            content = cache.get(key)
+            if content is not None:
+                response = HttpResponse(content)
+            else:
+                with use_primary():
+                    response = view(request, *args, **kwargs)
+                if response.status_code == HTTPStatus.OK:
+                    cache.set(key, response.content, PAGE_CACHE_TIMEOUT)
+
+            if has_session_cookie(request):
+                patch_cache_control(response, private=True)
+            else:
+                patch_cache_control(
+                    response, public=True, max_age=PUBLIC_CACHE_MAX_AGE
+                )
+                patch_vary_headers(response, ('Cookie',))
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def index_scopes():
+    return (INDEX_SCOPE, GROUPS_SCOPE)
+
+
+def group_posts_scopes(slug):
+    group_id = (
+        Group.objects.filter(slug=slug).values_list('pk', flat=True).first()
+    )
+    return (group_scope(group_id),)
+
+
+def profile_scopes(username):
+    author_id = (
+        User.objects.filter(username=username)
+        .values_list('pk', flat=True)
+        .first()
+    )
+    return (author_scope(author_id), GROUPS_SCOPE)
+
+
+def post_detail_scopes(post_id):
+    author_id = (
+        Post.objects.filter(pk=post_id)
+        .values_list('author_id', flat=True)
+        .first()
+    )
+    return (post_scope(post_id), author_scope(author_id), GROUPS_SCOPE)
@@ -0,0 +1,34 @@
+import hashlib
+
+from django.views.decorators.http import condition
+
+from core.auth import is_anonymous_request
+from core.db import reads_from_replica
+
+from .cache import get_request_scopes, get_versions
+
+
+def conditional_page(get_scopes):
+    """Отвечает 304, если страница не менялась с прошлого запроса.
+
+    ETag строится из версий тех же областей кэша, что и у
+    cache_anonymous_page: они меняются при сохранении и удалении поста
+    или группы, а их чтение не обращается к таблице постов. В ETag
+    входит и пользователь. Last-Modified не отдаётся: дата изменения
+    постов не меняется при удалении, и ответ на If-Modified-Since
+    оказался бы устаревшим. Страница вошедшего пользователя, прочитанная
+    с реплики, ETag не получает: реплика может отставать от версий.
+    """
+    def etag_func(request, *args, **kwargs):
+        anonymous = is_anonymous_request(request)
+        if reads_from_replica() and not anonymous:
+            return None
+        raw = '|'.join(map(str, (
+            *get_versions(
+                get_request_scopes(request, get_scopes, *args, **kwargs)
+            ),
+            None if anonymous else request.user.pk,
+        )))
+        return hashlib.md5(raw.encode()).hexdigest()
+
+    return condition(etag_func=etag_func)
@@ -3,3 +3,19 @@ POSTS_SYMBOLS = 15
 CLS_CYCLE = 13
 AMOUNT_POST_CYCLE = 3
 NUM_OF_TEXTS_SYMBOLS_IN_TITLE = 30
+PAGE_CACHE_TIMEOUT = 60 * 60
+PUBLIC_CACHE_MAX_AGE = 60
+PAGES_ON_EACH_SIDE = 2
+PAGES_ON_ENDS = 1
+FEED_EXCERPT_SYMBOLS = 500
+ADMIN_EXACT_COUNT = 10000
+TIMELINE_LENGTH = 1000
+TIMELINE_TIMEOUT = 60 * 60 * 24
+TIMELINE_LOCK_TIMEOUT = 5
+TIMELINE_LOCK_WAIT = 0.01
+POST_JOBS_BATCH_SIZE = 100
+POST_JOBS_LEASE_SECONDS = 60
+POST_JOBS_IDLE_SECONDS = 5
+POST_JOBS_MAX_ATTEMPTS = 5
+API_BATCH_SIZE = 1000
+API_PAGE_LIMIT = 100
@@ -0,0 +1,78 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import AuthorStats, Group, Post
+
+
+def change_author_count(author_id, delta):
+    """Меняет счётчик постов автора на delta."""
+    updated = AuthorStats.objects.filter(author_id=author_id).update(
+        posts_count=F('posts_count') + delta
+    )
+    if not updated and delta > 0:
+        AuthorStats.objects.create(
+            author_id=author_id,
+            posts_count=Post.objects.filter(author_id=author_id).count(),
+        )
+
+
+def change_group_count(group_id, delta):
+    """Меняет счётчик постов группы на delta."""
+    if group_id is not None:
+        Group.objects.filter(pk=group_id).update(
+            posts_count=F('posts_count') + delta
+        )
+
+
+def add_posts_to_counters(posts):
+    """Увеличивает счётчики для пачки новых постов."""
+    author_deltas = Counter(post.author_id for post in posts)
+    group_deltas = Counter(
+        post.group_id for post in posts if post.group_id is not None
+    )
+    for author_id, delta in author_deltas.items():
+        change_author_count(author_id, delta)
+    for group_id, delta in group_deltas.items():
+        change_group_count(group_id, delta)
+
+
+def get_author_posts_count(author):
+    """Число постов автора из денормализованного счётчика."""
+    try:
+        return author.stats.posts_count
+    except AuthorStats.DoesNotExist:
+        return 0
+
+
+def recount_posts(batch_size=None):
+    """Пересчитывает счётчики постов всех авторов и групп."""
+    author_counts = (
+        Post.objects.order_by()
+        .values('author')
+        .annotate(total=Count('pk'))
+        .values_list('author', 'total')
+    )
+    group_counts = (
+        Post.objects.filter(group=OuterRef('pk'))
+        .order_by()
+        .values('group')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    with transaction.atomic():
+        AuthorStats.objects.all().delete()
+        AuthorStats.objects.bulk_create(
+            (
+                AuthorStats(author_id=author_id, posts_count=total)
+                for author_id, total in author_counts.iterator()
+            ),
+            batch_size=batch_size,
+        )
+        Group.objects.update(
+            posts_count=Coalesce(
+                Subquery(group_counts, output_field=IntegerField()), 0
+            )
+        )
@@ -0,0 +1,165 @@
+import csv
+import json
+from contextlib import contextmanager
+from itertools import islice
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Group, Post, User
+
+FIELDS = ('text', 'pub_date', 'author', 'group')
+FORMATS = ('jsonl', 'csv')
+
+
+def guess_format(path):
+    """Формат файла по расширению, по умолчанию JSONL."""
+    return 'csv' if path.endswith('.csv') else 'jsonl'
+
+
+def read_records(stream, file_format):
+    """Построчно читает записи постов, не загружая файл целиком."""
+    if file_format == 'csv':
+        yield from csv.DictReader(stream)
+        return
+
+    for line in stream:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+
+def write_records(stream, file_format, rows):
+    """Построчно пишет кортежи FIELDS в поток."""
+    if file_format == 'csv':
+        writer = csv.writer(stream)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+        return
+
+    for row in rows:
+        stream.write(json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False))
+        stream.write('\n')
+
+
+def export_rows(chunk_size):
+    """Посты для выгрузки без создания экземпляров моделей."""
+    rows = (
+        Post.objects.order_by('pk')
+        .values_list('text', 'pub_date', 'author__username', 'group__slug')
+        .iterator(chunk_size=chunk_size)
+    )
+    for text, pub_date, author, group in rows:
+        yield text, pub_date.isoformat(), author, group or ''
+
+
+def is_well_formed(record):
+    """Запись — словарь с непустым текстом и строковыми полями."""
+    if not isinstance(record, dict):
+        return False
+    text = record.get('text')
+    return isinstance(text, str) and bool(text.strip()) and all(
+        isinstance(record.get(name) or '', str)
+        for name in ('pub_date', 'author', 'group')
+    )
+
+
+def parse_pub_date(value):
+    """Дата публикации записи: now() без даты, None для неверной."""
+    if not value:
+        return timezone.now()
+    try:
+        pub_date = parse_datetime(value)
+    except ValueError:
+        return None
+    if pub_date is not None and timezone.is_naive(pub_date):
+        pub_date = timezone.make_aware(pub_date)
+    return pub_date
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+@contextmanager
+def preserved_post_dates():
+    """Отключает auto_now_add/auto_now у Post на время импорта."""
+    fields = [Post._meta.get_field(name) for name in ('pub_date', 'updated')]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class LookupMap:
+    """Кэш соответствия натуральных ключей и id, пополняемый пачками."""
+
+    def __init__(self, queryset, key_field):
+        self.queryset = queryset
+        self.key_field = key_field
+        self.ids = {}
+
+    def resolve(self, keys):
+        missing = {key for key in keys if key and key not in self.ids}
+        if missing:
+            lookup = {f'{self.key_field}__in': missing}
+            self.ids.update(
+                self.queryset.filter(**lookup)
+                .values_list(self.key_field, 'pk')
+            )
+
+    def get(self, key):
+        return self.ids.get(key)
+
+
+class PostImporter:
+    """Загружает посты пачками через bulk_create."""
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.authors = LookupMap(User.objects.all(), 'username')
+        self.groups = LookupMap(Group.objects.all(), 'slug')
+        self.imported = 0
+        self.skipped = 0
+
+    def build_post(self, record):
+        author_id = self.authors.get(record.get('author'))
+        group_slug = record.get('group') or None
+        group_id = self.groups.get(group_slug)
+        if author_id is None or (group_slug and group_id is None):
+            return None
+
+        pub_date = parse_pub_date(record.get('pub_date'))
+        if pub_date is None:
+            return None
+
+        return Post(
+            text=record['text'],
+            pub_date=pub_date,
+            updated=pub_date,
+            author_id=author_id,
+            group_id=group_id,
+        )
+
+    def import_records(self, records):
+        with preserved_post_dates():
+            for batch in batched(records, self.batch_size):
+                valid = [record for record in batch if is_well_formed(record)]
+                self.authors.resolve(record.get('author') for record in valid)
+                self.groups.resolve(record.get('group') for record in valid)
+                posts = [self.build_post(record) for record in valid]
+                posts = [post for post in posts if post is not None]
+                Post.objects.bulk_create(posts)
+                self.imported += len(posts)
+                self.skipped += len(batch) - len(posts)
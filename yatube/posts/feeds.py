@@ -0,0 +1,37 @@
+from .models import Post
+
+# Проекции столбцов для каждого контекста вывода. Полный текст поста,
+# пароль и прочие поля автора, описание группы в ленте не нужны и из
+# SQLite не читаются.
+AUTHOR_FIELDS = ('author__username', 'author__first_name', 'author__last_name')
+GROUP_FIELDS = ('group__slug', 'group__title')
+FEED_FIELDS = (
+    'pub_date', 'title', 'excerpt_html', 'author', 'group',
+    *AUTHOR_FIELDS, *GROUP_FIELDS,
+)
+POST_DETAIL_FIELDS = (
+    'pub_date', 'title', 'text_html', 'author', 'group',
+    *AUTHOR_FIELDS, 'author__stats__posts_count', *GROUP_FIELDS,
+)
+ADMIN_CHANGELIST_FIELDS = (
+    'pub_date', 'title', 'author', 'group', 'author__username', 'group__title',
+)
+GROUP_HEADER_FIELDS = ('title', 'slug', 'description', 'posts_count')
+AUTHOR_HEADER_FIELDS = (
+    'username', 'first_name', 'last_name', 'stats__posts_count',
+)
+
+
+def get_feed(**filters):
+    """Лента постов с авторами и группами, от новых к старым.
+
+    Авторы и группы подтягиваются через JOIN, поэтому страница ленты
+    загружается фиксированным числом запросов независимо от числа постов.
+    Читаются только столбцы FEED_FIELDS: лента выводит готовый отрывок.
+    """
+    return (
+        Post.objects.filter(**filters)
+        .select_related('author', 'group')
+        .only(*FEED_FIELDS)
+        .order_by('-pub_date', '-id')
+    )
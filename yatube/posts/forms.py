@@ -1,13 +1,71 @@
+from functools import partial
+
 from django import forms
+from django.forms.models import ModelChoiceIterator
 
+from .cache import get_group_choices
 from .models import Post
 
 
+class CachedGroupChoiceIterator(ModelChoiceIterator):
+    """Варианты выбора группы из кэша вместо запроса к базе."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        yield from get_group_choices()
+
+    def __len__(self):
+        return len(get_group_choices()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(get_group_choices())
+
+
+def cached_group_to_python(field, value):
+    """Проверяет группу по кэшу id вместо запроса к базе.
+
+    В форму попадает экземпляр с id и названием, остальные поля группы
+    загрузятся при первом обращении.
+    """
+    if value in field.empty_values:
+        return None
+    titles = dict(get_group_choices())
+    try:
+        pk = int(value)
+    except (TypeError, ValueError):
+        pk = None
+    if pk not in titles:
+        raise forms.ValidationError(
+            field.error_messages['invalid_choice'], code='invalid_choice'
+        )
+
+    return field.queryset.model.from_db(
+        field.queryset.db, ('id', 'title'), (pk, titles[pk])
+    )
+
+
+def use_cached_group_choices(field):
+    """Переводит ModelChoiceField группы на варианты из кэша."""
+    field.iterator = CachedGroupChoiceIterator
+    field.widget.choices = field.choices
+    field.to_python = partial(cached_group_to_python, field)
+    return field
+
+
 class PostForm(forms.ModelForm):
     class Meta:
         model = Post
         fields = ('text', 'group')
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        use_cached_group_choices(self.fields['group'])
+
+    def _get_validation_exclusions(self):
+        """Группа уже проверена по кэшу, повторный запрос не нужен."""
+        return [*super()._get_validation_exclusions(), 'group']
+
     def clean_text(self):
         data = self.cleaned_data['text']
         if data == '':
@@ -0,0 +1,194 @@
+import logging
+import threading
+from collections import defaultdict
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .constants import (
+    POST_JOBS_BATCH_SIZE, POST_JOBS_IDLE_SECONDS, POST_JOBS_LEASE_SECONDS,
+    POST_JOBS_MAX_ATTEMPTS,
+)
+from .models import PostJob
+from .search import index_post_ranges, index_posts, index_posts_after
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_JOB = 'search_index'
+SEARCH_INDEX_AFTER_JOB = 'search_index_after'
+SEARCH_INDEX_RANGE_JOB = 'search_index_range'
+
+# Обработчик получает ключи всех взятых задач своего типа разом и
+# должен быть идемпотентным: задача может выполниться повторно.
+JOB_HANDLERS = {
+    SEARCH_INDEX_JOB: index_posts,
+    SEARCH_INDEX_AFTER_JOB: index_posts_after,
+    SEARCH_INDEX_RANGE_JOB: index_post_ranges,
+}
+
+
+def enqueue(kind, keys):
+    """Ставит задачи в outbox в той же транзакции, что и запись поста.
+
+    Задача с тем же kind и key не дублируется: у неё растёт version, и
+    воркер выполнит её ещё раз, если уже взял в работу старую версию.
+    Попытки новой версии считаются заново.
+    """
+    with transaction.atomic():
+        for key in keys:
+            jobs = PostJob.objects.filter(kind=kind, key=str(key))
+            if not jobs.update(version=F('version') + 1, attempts=0):
+                PostJob.objects.create(kind=kind, key=str(key))
+    if settings.POST_JOBS_IN_PROCESS:
+        transaction.on_commit(worker.wake_up)
+
+
+def claim_jobs(batch_size):
+    """Берёт в аренду до batch_size свободных задач одним UPDATE.
+
+    Задачи, исчерпавшие POST_JOBS_MAX_ATTEMPTS попыток, не берутся:
+    они остаются в outbox с last_error до retry_failed_jobs.
+    """
+    lease = uuid4().hex
+    now = timezone.now()
+    available = PostJob.objects.filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now),
+        attempts__lt=POST_JOBS_MAX_ATTEMPTS,
+    ).order_by('pk')
+    PostJob.objects.filter(
+        pk__in=available.values('pk')[:batch_size]
+    ).update(
+        lease=lease,
+        locked_until=now + timedelta(seconds=POST_JOBS_LEASE_SECONDS),
+        attempts=F('attempts') + 1,
+    )
+    return list(PostJob.objects.filter(lease=lease))
+
+
+def finish_jobs(jobs):
+    """Удаляет выполненные задачи; поставленные заново освобождает."""
+    done = Q()
+    for job in jobs:
+        done |= Q(pk=job.pk, version=job.version)
+    PostJob.objects.filter(done).delete()
+    PostJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+        lease='', locked_until=None
+    )
+
+
+def fail_job(job, error):
+    """Записывает ошибку задачи; после последней попытки откладывает её."""
+    PostJob.objects.filter(pk=job.pk).update(last_error=repr(error))
+    if job.attempts >= POST_JOBS_MAX_ATTEMPTS:
+        logger.error(
+            'Задача %s:%s отложена после %d попыток',
+            job.kind, job.key, job.attempts,
+        )
+
+
+def run_handler(kind, jobs):
+    """Выполняет задачи одного типа и возвращает выполненные.
+
+    Если обработчик упал на пачке, задачи повторяются по одной:
+    сломанная задача не задерживает остальные.
+    """
+    try:
+        with transaction.atomic():
+            JOB_HANDLERS[kind]([job.key for job in jobs])
+    except Exception as error:
+        if len(jobs) > 1:
+            return [done for job in jobs for done in run_handler(kind, [job])]
+        logger.exception('Задача %s:%s не выполнена', kind, jobs[0].key)
+        fail_job(jobs[0], error)
+        return []
+    return jobs
+
+
+def process_jobs(batch_size=POST_JOBS_BATCH_SIZE):
+    """Выполняет одну пачку задач и возвращает число взятых.
+
+    Задачи группируются по типу, обработчик вызывается один раз на тип.
+    Упавшая задача остаётся в outbox и будет взята снова, когда истечёт
+    аренда: каждая задача выполняется хотя бы один раз, но не больше
+    POST_JOBS_MAX_ATTEMPTS раз подряд с ошибкой.
+    """
+    jobs = claim_jobs(batch_size)
+    jobs_by_kind = defaultdict(list)
+    for job in jobs:
+        jobs_by_kind[job.kind].append(job)
+    for kind, kind_jobs in jobs_by_kind.items():
+        done = run_handler(kind, kind_jobs)
+        if done:
+            finish_jobs(done)
+    return len(jobs)
+
+
+def retry_failed_jobs():
+    """Возвращает отложенные задачи в работу и отдаёт их число."""
+    return PostJob.objects.filter(
+        attempts__gte=POST_JOBS_MAX_ATTEMPTS
+    ).update(attempts=0, lease='', locked_until=None)
+
+
+def run_jobs(batch_size=POST_JOBS_BATCH_SIZE):
+    """Разбирает outbox, пока в нём есть свободные задачи."""
+    total = 0
+    while True:
+        processed = process_jobs(batch_size)
+        if not processed:
+            return total
+        total += processed
+
+
+class InProcessWorker:
+    """Фоновый поток, который разбирает outbox после коммита записи.
+
+    Поток запускается при первой задаче и завершается, если задач нет
+    POST_JOBS_IDLE_SECONDS. Задачи, которые он не успел взять, остаются
+    в outbox для следующего запуска или команды run_post_jobs.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def wake_up(self):
+        with self.lock:
+            self.event.set()
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name='post-jobs', daemon=True
+                )
+                self.thread.start()
+
+    def wait(self):
+        """Ждёт пробуждения; False, если поток пора завершить.
+
+        Решение о выходе принимается под той же блокировкой, что и в
+        wake_up: пробуждение не потеряется между таймаутом и выходом.
+        """
+        if not self.event.wait(POST_JOBS_IDLE_SECONDS):
+            with self.lock:
+                if not self.event.is_set():
+                    self.thread = None
+                    return False
+        self.event.clear()
+        return True
+
+    def run(self):
+        try:
+            while self.wait():
+                try:
+                    run_jobs()
+                except Exception:
+                    logger.exception('Фоновый разбор outbox прерван')
+        finally:
+            connection.close()
+
+
+worker = InProcessWorker()
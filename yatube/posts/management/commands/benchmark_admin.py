@@ -0,0 +1,23 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from posts.benchmark import AdminBenchmark
+
+
+class Command(BaseCommand):
+    help = 'Замеряет число запросов и время ответа админки постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--output', help='Сохранить результаты в JSON.')
+
+    def handle(self, *args, **options):
+        results = AdminBenchmark(
+            options['requests'], random_seed=options['seed']
+        ).run()
+        self.stdout.write(json.dumps(results, indent=2))
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as stream:
+                json.dump(results, stream, indent=2)
@@ -0,0 +1,44 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from posts.benchmark import SlowClientBenchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает WSGI-сервер с пулом потоков и yatube.asgi под '
+        'нагрузкой медленных клиентов: пропускная способность, задержки '
+        'и число одновременных соединений.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=None, help='Адрес страницы, по умолчанию /.'
+        )
+        parser.add_argument(
+            '--duration', type=float, default=5,
+            help='Секунды прогона для каждого сервера.',
+        )
+        parser.add_argument(
+            '--threads', type=int, default=settings.ASGI_THREADS
+        )
+        parser.add_argument('--slow', type=int, default=50)
+        parser.add_argument('--fast', type=int, default=4)
+        parser.add_argument(
+            '--delay', type=float, default=0.05,
+            help='Пауза медленного клиента между байтами запроса.',
+        )
+
+    def handle(self, *args, **options):
+        benchmark = SlowClientBenchmark(
+            options['path'] or reverse('posts:index'),
+            options['threads'],
+            options['slow'],
+            options['fast'],
+            options['delay'],
+        )
+        report = benchmark.run(options['duration'])
+        self.stdout.write(json.dumps(report, indent=2))
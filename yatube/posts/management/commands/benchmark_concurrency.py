@@ -0,0 +1,28 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.benchmark import ConcurrencyBenchmark
+from posts.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Читает ленту в несколько потоков, пока другой поток пишет посты, '
+        'и печатает число чтений и их задержку.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--duration', type=float, default=5, help='Секунды прогона.'
+        )
+        parser.add_argument('--readers', type=int, default=4)
+
+    def handle(self, *args, **options):
+        author = User.objects.order_by('pk').first()
+        if author is None:
+            raise CommandError('Нет пользователей: запустите seed_benchmark.')
+
+        benchmark = ConcurrencyBenchmark(options['readers'], author)
+        report = benchmark.run(options['duration'])
+        self.stdout.write(json.dumps(report, indent=2))
@@ -0,0 +1,20 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from posts.benchmark import TemplateBenchmark
+
+
+class Command(BaseCommand):
+    help = 'Замеряет время рендера каждого шаблона из templates/posts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--output', help='Сохранить результаты в JSON.')
+
+    def handle(self, *args, **options):
+        results = TemplateBenchmark(options['iterations']).run()
+        self.stdout.write(json.dumps(results, indent=2))
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as stream:
+                json.dump(results, stream, indent=2)
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.constants import POSTS_PAGE
+from posts.feeds import get_feed
+
+
+def uses_feed_index(plan):
+    """Проверяет, что SQLite читает посты по индексу и без сортировки."""
+    for line in plan.splitlines():
+        if 'USE TEMP B-TREE' in line:
+            return False
+        if 'SCAN' in line and 'posts_post' in line and 'INDEX' not in line:
+            return False
+
+    return True
+
+
+class Command(BaseCommand):
+    help = 'Печатает EXPLAIN QUERY PLAN для запросов лент постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Завершиться с ошибкой, если лента не использует индекс.',
+        )
+
+    def get_feed_queries(self):
+        """Запросы первой страницы каждой ленты из views."""
+        return {
+            'posts:index': get_feed(),
+            'posts:group_list': get_feed(group_id=0),
+            'posts:profile': get_feed(author_id=0),
+        }
+
+    def handle(self, *args, **options):
+        regressions = []
+        for name, queryset in self.get_feed_queries().items():
+            plan = queryset[:POSTS_PAGE].explain()
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(plan)
+            if not uses_feed_index(plan):
+                regressions.append(name)
+
+        if options['check'] and regressions:
+            raise CommandError(
+                'Ленты без индекса: {}'.format(', '.join(regressions))
+            )
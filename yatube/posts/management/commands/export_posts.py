@@ -0,0 +1,30 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from posts.exchange import FORMATS, export_rows, guess_format, write_records
+
+
+class Command(BaseCommand):
+    help = 'Выгружает посты в JSONL или CSV построчно.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к файлу или - для stdout.')
+        parser.add_argument('--format', choices=FORMATS)
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Число строк, читаемых из базы за один раз.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or guess_format(path)
+        rows = export_rows(options['chunk_size'])
+        if path == '-':
+            write_records(sys.stdout, file_format, rows)
+            return
+
+        with open(path, 'w', encoding='utf-8', newline='') as stream:
+            write_records(stream, file_format, rows)
@@ -0,0 +1,37 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from posts.exchange import FORMATS, PostImporter, guess_format, read_records
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает посты из JSONL или CSV с полями text, pub_date, '
+        'author (username) и group (slug).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к файлу или - для stdin.')
+        parser.add_argument('--format', choices=FORMATS)
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Число постов в одной транзакции.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or guess_format(path)
+        importer = PostImporter(options['batch_size'])
+        if path == '-':
+            importer.import_records(read_records(sys.stdin, file_format))
+        else:
+            with open(path, encoding='utf-8', newline='') as stream:
+                importer.import_records(read_records(stream, file_format))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено постов: {importer.imported}, '
+            f'пропущено: {importer.skipped}.'
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from posts.timelines import rebuild_timelines
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает ленты последних постов главной, групп и авторов.'
+
+    def handle(self, *args, **options):
+        count = rebuild_timelines()
+        self.stdout.write(self.style.SUCCESS(f'Перестроено лент: {count}.'))
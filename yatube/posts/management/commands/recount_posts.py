@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from posts.counters import recount_posts
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики постов авторов и групп.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Размер пачки при записи счётчиков авторов.',
+        )
+
+    def handle(self, *args, **options):
+        recount_posts(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS('Счётчики постов пересчитаны.'))
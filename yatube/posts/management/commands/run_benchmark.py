@@ -0,0 +1,44 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.benchmark import BenchmarkRunner, compare
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет p50/p95/p99, число SQL-запросов и размер ответа '
+        'для основных view.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100)
+        parser.add_argument(
+            '--anonymous',
+            action='store_true',
+            help='Читать страницы анонимно (через кэш страниц).',
+        )
+        parser.add_argument('--output', help='Сохранить результаты в JSON.')
+        parser.add_argument('--baseline', help='JSON прошлого прогона.')
+        parser.add_argument('--seed', type=int)
+
+    def handle(self, *args, **options):
+        runner = BenchmarkRunner(
+            options['requests'],
+            anonymous=options['anonymous'],
+            random_seed=options['seed'],
+        )
+        if runner.author is None:
+            raise CommandError('Нет постов: сначала запустите seed_benchmark.')
+
+        results = runner.run()
+        report = {'results': results}
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as stream:
+                baseline = json.load(stream)['results']
+            report['diff'] = compare(results, baseline)
+
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as stream:
+                json.dump(report, stream, indent=2, ensure_ascii=False)
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.constants import POST_JOBS_BATCH_SIZE
+from posts.jobs import process_jobs, retry_failed_jobs, run_jobs
+
+
+class Command(BaseCommand):
+    help = 'Выполняет задачи outbox, поставленные после записи постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Разобрать накопившиеся задачи и завершиться.',
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Вернуть в работу задачи, исчерпавшие попытки.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=POST_JOBS_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Пауза в секундах, когда задач нет.',
+        )
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            retried = retry_failed_jobs()
+            self.stdout.write(
+                self.style.SUCCESS(f'Возвращено задач: {retried}.')
+            )
+        if options['once']:
+            total = run_jobs(options['batch_size'])
+            self.stdout.write(
+                self.style.SUCCESS(f'Выполнено задач: {total}.')
+            )
+            return
+
+        while True:
+            if not process_jobs(options['batch_size']):
+                time.sleep(options['interval'])
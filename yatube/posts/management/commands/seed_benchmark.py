@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from posts.benchmark import seed
+
+
+class Command(BaseCommand):
+    help = 'Заполняет базу синтетическими пользователями, группами и постами.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--groups', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.1,
+            help='Показатель закона Ципфа для авторов и групп.',
+        )
+        parser.add_argument('--prefix', default='bench')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int)
+
+    def handle(self, *args, **options):
+        seed(
+            users=options['users'],
+            groups=options['groups'],
+            posts=options['posts'],
+            prefix=options['prefix'],
+            skew=options['skew'],
+            batch_size=options['batch_size'],
+            random_seed=options['seed'],
+        )
+        self.stdout.write(self.style.SUCCESS('Данные для бенчмарка созданы.'))
@@ -0,0 +1,73 @@
+# Generated by Django 2.2.16 on 2026-10-18 09:12
+
+from importlib import import_module
+
+from django.db import migrations, models
+from django.utils.html import linebreaks
+from django.utils.text import Truncator
+
+# SQLite добавляет столбцы пересозданием posts_post, при этом триггеры
+# поискового индекса удаляются. Снимаем их до изменения таблицы и создаём
+# заново после, в обе стороны миграции.
+search_index = import_module('posts.migrations.0008_post_search_index')
+CREATE_TRIGGERS = search_index.CREATE_SEARCH_INDEX[1:4]
+DROP_TRIGGERS = search_index.DROP_SEARCH_INDEX[:3]
+
+BATCH_SIZE = 500
+# Копия posts.rendering на момент миграции: её результат не должен
+# меняться вместе с живым кодом.
+FEED_EXCERPT_SYMBOLS = 500
+TITLE_SYMBOLS = 30
+RENDERED_FIELDS = ('text_html', 'excerpt_html', 'title')
+
+
+def render_post_text(text):
+    truncator = Truncator(text)
+    return {
+        'text_html': linebreaks(text, autoescape=True),
+        'excerpt_html': linebreaks(
+            truncator.chars(FEED_EXCERPT_SYMBOLS), autoescape=True
+        ),
+        'title': truncator.chars(TITLE_SYMBOLS),
+    }
+
+
+def render_posts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    posts = []
+    for post in Post.objects.only('text').iterator(chunk_size=BATCH_SIZE):
+        for name, value in render_post_text(post.text).items():
+            setattr(post, name, value)
+        posts.append(post)
+        if len(posts) == BATCH_SIZE:
+            Post.objects.bulk_update(posts, RENDERED_FIELDS)
+            posts = []
+    Post.objects.bulk_update(posts, RENDERED_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_post_search_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(DROP_TRIGGERS, CREATE_TRIGGERS),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='HTML отрывка для ленты'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='HTML текста поста'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='title',
+            field=models.CharField(blank=True, editable=False, max_length=30, verbose_name='Заголовок поста'),
+        ),
+        migrations.RunPython(render_posts, migrations.RunPython.noop),
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_post_rendered_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50, verbose_name='Тип задачи')),
+                ('key', models.CharField(max_length=100, verbose_name='Ключ задачи')),
+                ('version', models.PositiveIntegerField(default=0, verbose_name='Версия')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Число попыток')),
+                ('lease', models.CharField(blank=True, db_index=True, max_length=32, verbose_name='Аренда')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='Занята до')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата постановки')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='postjob',
+            constraint=models.UniqueConstraint(fields=('kind', 'key'), name='post_job_unique_key'),
+        ),
+    ]
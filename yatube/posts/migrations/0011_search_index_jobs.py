@@ -0,0 +1,31 @@
+from importlib import import_module
+
+from django.db import migrations
+
+# Индекс FTS5 больше не ведётся триггерами в транзакции записи: его
+# обновляют задачи outbox (posts.jobs). Таблица становится обычной, а
+# не external content, чтобы воркер мог удалить строку по rowid, не зная
+# старого текста поста.
+search_index = import_module('posts.migrations.0008_post_search_index')
+
+CREATE_JOB_SEARCH_INDEX = [
+    *search_index.DROP_SEARCH_INDEX,
+    'CREATE VIRTUAL TABLE posts_post_fts USING fts5(text)',
+    'INSERT INTO posts_post_fts(rowid, text) SELECT id, text FROM posts_post',
+]
+
+DROP_JOB_SEARCH_INDEX = [
+    'DROP TABLE posts_post_fts',
+    *search_index.CREATE_SEARCH_INDEX,
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_post_jobs'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_JOB_SEARCH_INDEX, DROP_JOB_SEARCH_INDEX),
+    ]
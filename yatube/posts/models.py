@@ -1,7 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 
-from .constants import POSTS_SYMBOLS
+from .constants import NUM_OF_TEXTS_SYMBOLS_IN_TITLE, POSTS_SYMBOLS
+from .rendering import RENDERED_FIELDS, render_post_text
 
 User = get_user_model()
 
@@ -22,22 +23,114 @@ class Group(models.Model):
         verbose_name="Описание группы",
         help_text="Введите описание",
     )
+    posts_count = models.PositiveIntegerField(
+        verbose_name="Количество постов",
+        default=0,
+        editable=False,
+    )
 
     def __str__(self) -> str:
         """Метод вывода названия группы."""
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    """QuerySet постов, поддерживающий счётчики и кэш при bulk_create."""
+
+    def _last_pk(self):
+        return self.model._base_manager.using(self.db).aggregate(
+            last_pk=models.Max('pk')
+        )['last_pk'] or 0
+
+    def bulk_create(self, objs, batch_size=None, ignore_conflicts=False):
+        from .cache import invalidate_posts
+        from .counters import add_posts_to_counters
+        from .jobs import SEARCH_INDEX_RANGE_JOB, enqueue
+        from .timelines import reset_timelines
+
+        objs = list(objs)
+        for obj in objs:
+            obj.render_text()
+        # Чтение до транзакции: в SQLite транзакция, начатая с чтения,
+        # не может стать пишущей, пока пишет воркер outbox.
+        last_pk = self._last_pk()
+        with transaction.atomic(using=self.db):
+            posts = super().bulk_create(objs, batch_size, ignore_conflicts)
+            if not ignore_conflicts:
+                self._set_inserted_pks(posts)
+            add_posts_to_counters(posts)
+            enqueue(
+                SEARCH_INDEX_RANGE_JOB, self._inserted_ranges(posts, last_pk)
+            )
+        reset_timelines(posts)
+        invalidate_posts(posts)
+        for post in posts:
+            post.remember_counted_fields()
+
+        return posts
+
+    def _inserted_ranges(self, posts, last_pk):
+        """Диапазоны id вставленных постов в виде «first-last».
+
+        Посты без id (явные id у части пачки, ignore_conflicts) лежат
+        между last_pk и максимальным id после вставки.
+        """
+        ids = sorted(post.pk for post in posts if post.pk is not None)
+        ranges = []
+        for pk in ids:
+            if ranges and ranges[-1][1] == pk - 1:
+                ranges[-1][1] = pk
+            else:
+                ranges.append([pk, pk])
+        if len(ids) < len(posts):
+            ranges.append([last_pk + 1, self._last_pk()])
+        return [f'{first}-{last}' for first, last in ranges]
+
+    def _set_inserted_pks(self, posts):
+        """Проставляет id постам, если база их не вернула (SQLite).
+
+        Пока транзакция держит блокировку записи, AUTOINCREMENT выдаёт
+        вставленным строкам id подряд, так что последний id наибольший.
+        Если у части постов id задан явно, это не так, и id не
+        проставляются.
+        """
+        if any(post.pk is not None for post in posts):
+            return
+        first_pk = self._last_pk() - len(posts) + 1
+        for pk, post in enumerate(posts, start=first_pk):
+            post.pk = pk
+
+
 class Post(models.Model):
     """Модель Post."""
     text = models.TextField(
         verbose_name="Текст поста",
         help_text="Введите текст поста",
     )
+    text_html = models.TextField(
+        verbose_name="HTML текста поста",
+        editable=False,
+        blank=True,
+    )
+    excerpt_html = models.TextField(
+        verbose_name="HTML отрывка для ленты",
+        editable=False,
+        blank=True,
+    )
+    title = models.CharField(
+        verbose_name="Заголовок поста",
+        max_length=NUM_OF_TEXTS_SYMBOLS_IN_TITLE,
+        editable=False,
+        blank=True,
+    )
     pub_date = models.DateTimeField(
         verbose_name="Дата публикации",
         auto_now_add=True,
     )
+    updated = models.DateTimeField(
+        verbose_name="Дата изменения",
+        auto_now=True,
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -55,6 +148,113 @@ class Post(models.Model):
         help_text="Укажите группу",
     )
 
+    objects = PostQuerySet.as_manager()
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_feed_idx',
+            ),
+            models.Index(
+                fields=('group', '-pub_date', '-id'),
+                name='post_group_feed_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+        )
+
     def __str__(self) -> str:
         """Метод возвращает первые 15 символов поста."""
+        if 'text' in self.get_deferred_fields():
+            return self.title[:POSTS_SYMBOLS]
         return self.text[:POSTS_SYMBOLS]
+
+    def save(self, *args, **kwargs):
+        """Пересчитывает HTML и отрывок поста перед сохранением."""
+        update_fields = kwargs.get('update_fields')
+        text_loaded = 'text' not in self.get_deferred_fields()
+        if text_loaded and (update_fields is None or 'text' in update_fields):
+            self.render_text()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *RENDERED_FIELDS}
+        super().save(*args, **kwargs)
+
+    def render_text(self):
+        """Заполняет поля, вычисляемые из текста поста."""
+        for name, value in render_post_text(self.text).items():
+            setattr(self, name, value)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает автора и группу, с которыми пост загружен из базы."""
+        instance = super().from_db(db, field_names, values)
+        instance.remember_counted_fields()
+        return instance
+
+    def remember_counted_fields(self):
+        """Сохраняет значения полей, по которым ведутся счётчики постов."""
+        self._counted_fields = {
+            name: self.__dict__[name]
+            for name in ('author_id', 'group_id')
+            if name in self.__dict__
+        }
+
+
+class AuthorStats(models.Model):
+    """Денормализованная статистика автора."""
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name="Автор",
+    )
+    posts_count = models.PositiveIntegerField(
+        verbose_name="Количество постов",
+        default=0,
+    )
+
+    def __str__(self) -> str:
+        """Метод вывода автора и числа его постов."""
+        return f'{self.author}: {self.posts_count}'
+
+
+class PostJob(models.Model):
+    """Задача outbox, которую после записи поста выполняет воркер.
+
+    Пара (kind, key) уникальна: повторная постановка увеличивает
+    version. Воркер берёт задачу в аренду до locked_until и удаляет её,
+    только если version не изменилась за время выполнения.
+    """
+    kind = models.CharField(verbose_name="Тип задачи", max_length=50)
+    key = models.CharField(verbose_name="Ключ задачи", max_length=100)
+    version = models.PositiveIntegerField(
+        verbose_name="Версия", default=0,
+    )
+    attempts = models.PositiveIntegerField(
+        verbose_name="Число попыток", default=0,
+    )
+    lease = models.CharField(
+        verbose_name="Аренда", max_length=32, blank=True, db_index=True,
+    )
+    locked_until = models.DateTimeField(
+        verbose_name="Занята до", null=True, blank=True,
+    )
+    last_error = models.TextField(verbose_name="Последняя ошибка", blank=True)
+    created = models.DateTimeField(
+        verbose_name="Дата постановки", auto_now_add=True,
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('kind', 'key'), name='post_job_unique_key',
+            ),
+        )
+
+    def __str__(self) -> str:
+        """Метод вывода типа и ключа задачи."""
+        return f'{self.kind}:{self.key}'
@@ -0,0 +1,22 @@
+from django.utils.html import linebreaks
+from django.utils.text import Truncator
+
+from .constants import FEED_EXCERPT_SYMBOLS, NUM_OF_TEXTS_SYMBOLS_IN_TITLE
+
+RENDERED_FIELDS = ('text_html', 'excerpt_html', 'title')
+
+
+def render_post_text(text):
+    """Готовит HTML поста, отрывок для ленты и заголовок страницы.
+
+    Результат совпадает с фильтрами linebreaks и truncatechars, но
+    считается один раз при сохранении, а не при каждом выводе шаблона.
+    """
+    truncator = Truncator(text)
+    return {
+        'text_html': linebreaks(text, autoescape=True),
+        'excerpt_html': linebreaks(
+            truncator.chars(FEED_EXCERPT_SYMBOLS), autoescape=True
+        ),
+        'title': truncator.chars(NUM_OF_TEXTS_SYMBOLS_IN_TITLE),
+    }
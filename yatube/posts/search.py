@@ -0,0 +1,138 @@
+from django.db import connection, transaction
+from django.db.models.expressions import RawSQL
+
+from .feeds import get_feed
+from .models import Post
+
+SEARCH_INDEX_TABLE = 'posts_post_fts'
+
+
+def build_match_query(query):
+    """Превращает пользовательский ввод в безопасный запрос FTS5.
+
+    Каждое слово берётся в кавычки и ищется по префиксу, слова
+    объединяются через AND. Пустой ввод даёт пустую строку.
+    """
+    terms = [
+        '"{}"*'.format(term.replace('"', '""')) for term in query.split()
+    ]
+    return ' '.join(terms)
+
+
+def matching_ids(match_query):
+    """Подзапрос с id постов, подходящих под запрос FTS5."""
+    return RawSQL(
+        f'SELECT rowid FROM {SEARCH_INDEX_TABLE} '
+        f'WHERE {SEARCH_INDEX_TABLE} MATCH %s',
+        (match_query,),
+    )
+
+
+def index_posts(post_ids):
+    """Переиндексирует посты: удалённые убираются из индекса."""
+    post_ids = [int(post_id) for post_id in post_ids]
+    placeholders = ', '.join(['%s'] * len(post_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_INDEX_TABLE} '
+            f'WHERE rowid IN ({placeholders})',
+            post_ids,
+        )
+        cursor.execute(
+            f'INSERT INTO {SEARCH_INDEX_TABLE}(rowid, text) '
+            f'SELECT id, text FROM {Post._meta.db_table} '
+            f'WHERE id IN ({placeholders})',
+            post_ids,
+        )
+
+
+def index_post_ranges(ranges):
+    """Переиндексирует посты из диапазонов id вида «first-last».
+
+    Так индексируются посты из bulk_create: задача одна на пачку, а
+    переиндексируются только вставленные ею строки.
+    """
+    with connection.cursor() as cursor:
+        for key in ranges:
+            first_id, last_id = map(int, key.split('-'))
+            cursor.execute(
+                f'DELETE FROM {SEARCH_INDEX_TABLE} '
+                'WHERE rowid BETWEEN %s AND %s',
+                (first_id, last_id),
+            )
+            cursor.execute(
+                f'INSERT INTO {SEARCH_INDEX_TABLE}(rowid, text) '
+                f'SELECT id, text FROM {Post._meta.db_table} '
+                'WHERE id BETWEEN %s AND %s',
+                (first_id, last_id),
+            )
+
+
+def index_posts_after(post_ids):
+    """Переиндексирует посты с id больше наименьшего из post_ids.
+
+    Остался для задач, поставленных до index_post_ranges: bulk_create
+    их больше не ставит.
+    """
+    after_id = min(int(post_id) for post_id in post_ids)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_INDEX_TABLE} WHERE rowid > %s', (after_id,)
+        )
+        cursor.execute(
+            f'INSERT INTO {SEARCH_INDEX_TABLE}(rowid, text) '
+            f'SELECT id, text FROM {Post._meta.db_table} WHERE id > %s',
+            (after_id,),
+        )
+
+
+def rebuild_search_index():
+    """Перестраивает полнотекстовый индекс по таблице постов.
+
+    Нужен после изменений в обход сигналов, например QuerySet.update().
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_INDEX_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {SEARCH_INDEX_TABLE}(rowid, text) '
+            f'SELECT id, text FROM {Post._meta.db_table}'
+        )
+
+
+class SearchResults:
+    """Ранжированные результаты поиска для Paginator.
+
+    COUNT и выборка страницы идут по индексу FTS5, посты страницы
+    загружаются одним запросом с авторами и группами.
+    """
+
+    def __init__(self, query):
+        self.match_query = build_match_query(query)
+
+    def count(self):
+        if not self.match_query:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT COUNT(*) FROM {SEARCH_INDEX_TABLE} '
+                f'WHERE {SEARCH_INDEX_TABLE} MATCH %s',
+                (self.match_query,),
+            )
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, page):
+        if not self.match_query:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {SEARCH_INDEX_TABLE} '
+                f'WHERE {SEARCH_INDEX_TABLE} MATCH %s '
+                'ORDER BY rank LIMIT %s OFFSET %s',
+                (self.match_query, page.stop - page.start, page.start),
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        posts = get_feed(pk__in=ids).in_bulk()
+        return [posts[pk] for pk in ids if pk in posts]
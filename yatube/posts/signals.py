@@ -0,0 +1,59 @@
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_group, invalidate_posts
+from .counters import change_author_count, change_group_count
+from .jobs import SEARCH_INDEX_JOB, enqueue
+from .models import Group, Post
+from .timelines import get_backend, update_timelines
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, update_fields, **kwargs):
+    """Обновляет ленты, счётчики и кэш при создании и изменении поста.
+
+    Поисковый индекс обновляет воркер по задаче из outbox.
+    """
+    update_timelines(instance, created=created)
+    invalidate_posts((instance,))
+    if update_fields is None or 'text' in update_fields:
+        enqueue(SEARCH_INDEX_JOB, (instance.pk,))
+    if created:
+        change_author_count(instance.author_id, 1)
+        change_group_count(instance.group_id, 1)
+    else:
+        counted = getattr(instance, '_counted_fields', {})
+        old_author_id = counted.get('author_id', instance.author_id)
+        if old_author_id != instance.author_id:
+            change_author_count(old_author_id, -1)
+            change_author_count(instance.author_id, 1)
+        old_group_id = counted.get('group_id', instance.group_id)
+        if old_group_id != instance.group_id:
+            change_group_count(old_group_id, -1)
+            change_group_count(instance.group_id, 1)
+    instance.remember_counted_fields()
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    """Убирает пост из лент, уменьшает счётчики и сбрасывает кэш."""
+    update_timelines(instance, deleted=True)
+    invalidate_posts((instance,))
+    enqueue(SEARCH_INDEX_JOB, (instance.pk,))
+    change_author_count(instance.author_id, -1)
+    change_group_count(instance.group_id, -1)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_pages(sender, instance, **kwargs):
+    """Сбрасывает кэш страниц, где выводится группа."""
+    invalidate_group(instance)
+
+
+@receiver(setting_changed)
+def reset_timeline_backend(setting, **kwargs):
+    """Подхватывает новое хранилище лент при смене TIMELINE_BACKEND."""
+    if setting == 'TIMELINE_BACKEND':
+        get_backend.cache_clear()
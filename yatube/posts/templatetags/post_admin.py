@@ -0,0 +1,48 @@
+from django import template
+from django.contrib.admin.templatetags.admin_list import date_hierarchy
+from django.db.models import Max, Min
+from django.utils import timezone
+
+register = template.Library()
+
+
+@register.inclusion_tag('admin/date_hierarchy.html')
+def post_date_hierarchy(cl):
+    """date_hierarchy, у которого список лет строится по индексу.
+
+    Django собирает годы через DISTINCT по всей таблице. Здесь границы
+    берутся из MIN/MAX, а каждый год проверяется EXISTS по диапазону
+    индекса. Месяцы и дни отдаются Django: они уже ограничены годом.
+    """
+    field_name = cl.date_hierarchy
+    if any(key.startswith(f'{field_name}__') for key in cl.params):
+        return date_hierarchy(cl)
+
+    date_range = cl.queryset.aggregate(
+        first=Min(field_name), last=Max(field_name)
+    )
+    if date_range['first'] is None:
+        return date_hierarchy(cl)
+    first_year = timezone.localtime(date_range['first']).year
+    last_year = timezone.localtime(date_range['last']).year
+    if first_year == last_year:
+        return date_hierarchy(cl)
+
+    year_field = f'{field_name}__year'
+    years = [
+        year for year in range(first_year, last_year + 1)
+        if cl.queryset.filter(**{year_field: year}).exists()
+    ]
+    return {
+        'show': True,
+        'back': None,
+        'choices': [
+            {
+                'link': cl.get_query_string(
+                    {year_field: str(year)}, [f'{field_name}__']
+                ),
+                'title': str(year),
+            }
+            for year in years
+        ],
+    }
@@ -0,0 +1,204 @@
+from datetime import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Group, Post, User
+from ..utils import EstimatedCountPaginator
+from .utils import QueryBudgetMixin
+
+# Сессия, пользователь, два COUNT с ограничением, страница постов,
+# годы для date_hierarchy и версия кэша групп. От числа постов и групп
+# не зависит.
+CHANGELIST_QUERY_BUDGET = 7
+
+
+class PostAdminTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.admin,
+            group=cls.group,
+            text='Очень длинный текст поста ' * 100,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.admin)
+
+    def test_changelist_shows_title_without_full_text(self):
+        """Список постов выводит заголовок и не читает полный текст."""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse('admin:posts_post_changelist')
+            )
+        self.assertContains(response, self.post.title)
+        self.assertNotContains(response, self.post.text)
+        for query in context.captured_queries:
+            with self.subTest(sql=query['sql']):
+                self.assertNotIn('"posts_post"."text"', query['sql'])
+
+    def test_change_form_loads_full_text(self):
+        """Форма редактирования поста по-прежнему получает весь текст."""
+        response = self.client.get(
+            reverse('admin:posts_post_change', args=(self.post.pk,))
+        )
+        self.assertContains(response, self.post.text.strip())
+
+    def test_list_editable_saves_deferred_post(self):
+        """Смена группы из списка не портит текст и его HTML."""
+        another_group = Group.objects.create(
+            title='Другая группа',
+            slug='another-slug',
+            description='Другое описание',
+        )
+        response = self.client.post(
+            reverse('admin:posts_post_changelist'),
+            {
+                'form-TOTAL_FORMS': 1,
+                'form-INITIAL_FORMS': 1,
+                'form-0-id': self.post.pk,
+                'form-0-group': another_group.pk,
+                '_save': 'Сохранить',
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.group, another_group)
+        self.assertEqual(post.text, self.post.text)
+        self.assertEqual(post.text_html, self.post.text_html)
+
+
+class PostAdminScalabilityTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.admin)
+
+    def add_posts_and_groups(self, count):
+        start = Group.objects.count()
+        groups = [
+            Group.objects.create(
+                title=f'Группа {i}', slug=f'group-{i}', description='-'
+            )
+            for i in range(start, start + count)
+        ]
+        Post.objects.bulk_create(
+            Post(author=self.admin, group=group, text=f'Пост {group.slug}')
+            for group in groups
+        )
+
+    def get_changelist(self, **params):
+        return self.client.get(
+            reverse('admin:posts_post_changelist'), params
+        )
+
+    def test_changelist_queries_do_not_grow(self):
+        """Число запросов списка не растёт с числом постов и групп."""
+        for count in (5, 30):
+            with self.subTest(groups=Group.objects.count() + count):
+                self.add_posts_and_groups(count)
+                self.get_changelist()
+                with self.assertQueryBudget(CHANGELIST_QUERY_BUDGET):
+                    response = self.get_changelist()
+                self.assertContains(response, 'Группа 0', count=None)
+
+    def test_group_select_marks_row_group(self):
+        """В каждой строке выбрана группа этого поста."""
+        self.add_posts_and_groups(2)
+        response = self.get_changelist()
+        self.assertContains(response, '<select name="form-1-group"')
+        for group in Group.objects.all():
+            self.assertContains(
+                response,
+                f'<option value="{group.pk}" selected>{group.title}</option>',
+            )
+
+    def test_group_choices_follow_group_changes(self):
+        """Кэш списка групп сбрасывается при изменении групп."""
+        self.add_posts_and_groups(1)
+        self.get_changelist()
+        Group.objects.create(title='Новая группа', slug='new', description='-')
+        self.assertContains(self.get_changelist(), 'Новая группа')
+
+    def test_author_uses_raw_id_widget(self):
+        """Автор выбирается по id, а не из списка всех пользователей."""
+        self.add_posts_and_groups(1)
+        response = self.client.get(
+            reverse('admin:posts_post_change', args=(Post.objects.get().pk,))
+        )
+        self.assertContains(response, 'vForeignKeyRawIdAdminField')
+
+    def test_date_hierarchy_drilldown(self):
+        """Список постов фильтруется по году публикации."""
+        self.add_posts_and_groups(2)
+        year = Post.objects.first().pub_date.year
+        response = self.get_changelist(pub_date__year=year)
+        self.assertEqual(response.context['cl'].result_count, 2)
+        response = self.get_changelist(pub_date__year=year - 1)
+        self.assertEqual(response.context['cl'].result_count, 0)
+
+    def test_date_hierarchy_years_use_index_probes(self):
+        """Годы выводятся без DISTINCT по всей таблице."""
+        self.add_posts_and_groups(3)
+        for post, year in zip(Post.objects.order_by('pk'), (2019, 2021, 2022)):
+            Post.objects.filter(pk=post.pk).update(
+                pub_date=timezone.make_aware(datetime(year, 6, 1))
+            )
+        with CaptureQueriesContext(connection) as context:
+            response = self.get_changelist()
+        for year in ('2019', '2021', '2022'):
+            self.assertContains(response, f'?pub_date__year={year}')
+        self.assertNotContains(response, '?pub_date__year=2020')
+        for query in context.captured_queries:
+            self.assertNotIn('DISTINCT', query['sql'])
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        author = User.objects.create_user(username='TestAuthor')
+        Post.objects.bulk_create(
+            Post(author=author, text=f'Пост {i}') for i in range(10)
+        )
+        Post.objects.filter(pk__in=Post.objects.order_by('pk')[:4]).delete()
+
+    @mock.patch('posts.utils.ADMIN_EXACT_COUNT', 20)
+    def test_small_table_counted_exactly(self):
+        """Небольшая выборка считается точно."""
+        paginator = EstimatedCountPaginator(Post.objects.order_by('pk'), 2)
+        self.assertEqual(paginator.count, 6)
+
+    @mock.patch('posts.utils.ADMIN_EXACT_COUNT', 5)
+    def test_large_table_estimated_by_max_pk(self):
+        """Большая таблица оценивается по максимальному ключу."""
+        queryset = Post.objects.order_by('pk')
+        paginator = EstimatedCountPaginator(queryset, 2)
+        self.assertEqual(paginator.count, queryset.last().pk)
+        filtered = EstimatedCountPaginator(
+            queryset.filter(text__startswith='Пост'), 2
+        )
+        self.assertEqual(filtered.count, 5)
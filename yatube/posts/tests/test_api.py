@@ -0,0 +1,267 @@
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from users.models import ApiToken
+
+from ..constants import API_BATCH_SIZE, POSTS_PAGE
+from ..models import Group, Post, PostJob, User
+from .utils import QueryBudgetMixin
+
+
+class PostBatchCreateTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.token, cls.key = ApiToken.issue(cls.author)
+        cls.url = reverse('posts:api_post_batch_create')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def post_batch(self, posts, key=None):
+        return self.client.post(
+            self.url,
+            json.dumps({'posts': posts}),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=f'Token {key or self.key}',
+        )
+
+    def test_batch_creates_posts_of_token_owner(self):
+        """Пачка постов создаётся от владельца токена, id в ответе."""
+        response = self.post_batch([
+            {'text': 'Первый пост'},
+            {'text': 'Второй пост', 'group': self.group.pk},
+        ])
+        self.assertEqual(response.status_code, 201)
+        ids = response.json()['ids']
+        posts = Post.objects.filter(pk__in=ids).order_by('pk')
+        self.assertEqual(
+            [(post.pk, post.text, post.group_id) for post in posts],
+            [(ids[0], 'Первый пост', None),
+             (ids[1], 'Второй пост', self.group.pk)],
+        )
+        self.assertTrue(all(post.author == self.author for post in posts))
+        self.author.stats.refresh_from_db()
+        self.assertEqual(self.author.stats.posts_count, 2)
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, 1)
+        self.assertTrue(PostJob.objects.exists())
+
+    def test_invalid_post_rejects_whole_batch(self):
+        """Ошибка в одном посте отклоняет всю пачку."""
+        response = self.post_batch([
+            {'text': 'Нормальный пост'},
+            {'text': ''},
+            {'text': 'Пост', 'group': 10 ** 6},
+        ])
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['errors']
+        self.assertEqual(set(errors), {'1', '2'})
+        self.assertEqual(errors['1']['text'][0]['code'], 'required')
+        self.assertEqual(errors['2']['group'][0]['code'], 'invalid_choice')
+        self.assertFalse(Post.objects.exists())
+
+    def test_rejects_wrong_field_types(self):
+        """Текст не строкой и группа не числом отклоняются до PostForm."""
+        response = self.post_batch([
+            {'text': 42},
+            {'text': 'Пост', 'group': str(self.group.pk)},
+            {'text': 'Пост', 'group': True},
+            {'text': 'Пост', 'group': None},
+        ])
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['errors']
+        self.assertEqual(set(errors), {'0', '1', '2'})
+        self.assertEqual(errors['0']['text'][0]['code'], 'invalid_type')
+        self.assertEqual(errors['1']['group'][0]['code'], 'invalid_type')
+        self.assertFalse(Post.objects.exists())
+
+    def test_requires_token(self):
+        """Без токена или с чужим ключом пачка не принимается."""
+        response = self.client.post(
+            self.url, '{"posts": [{"text": "Пост"}]}',
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+        response = self.post_batch([{'text': 'Пост'}], key='wrong-key')
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(Post.objects.exists())
+
+    def test_rejects_malformed_batch(self):
+        """Неверный JSON, пустая и слишком большая пачка отклоняются."""
+        bodies = (
+            'not json',
+            '[]',
+            '{"posts": []}',
+            json.dumps({'posts': [{'text': 'Пост'}] * (API_BATCH_SIZE + 1)}),
+        )
+        for body in bodies:
+            with self.subTest(body=body[:20]):
+                response = self.client.post(
+                    self.url, body, content_type='application/json',
+                    HTTP_AUTHORIZATION=f'Token {self.key}',
+                )
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+    def test_batch_queries_do_not_grow_with_size(self):
+        """Число запросов не зависит от размера пачки."""
+        self.post_batch([{'text': 'Прогрев'}])
+        with self.assertQueryBudget(13) as small:
+            self.post_batch([{'text': 'Пост', 'group': self.group.pk}])
+        with self.assertQueryBudget(len(small) + 2):
+            response = self.post_batch([
+                {'text': f'Пост {i}', 'group': self.group.pk}
+                for i in range(200)
+            ])
+        self.assertEqual(len(response.json()['ids']), 200)
+
+
+class FeedApiTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.another_author = User.objects.create_user(username='Another')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(
+                author=cls.author if i % 2 else cls.another_author,
+                text=f'Пост номер {i}',
+                group=cls.group if i % 3 else None,
+            )
+            for i in range(25)
+        )
+        # Одинаковая дата у части постов проверяет порядок по id.
+        Post.objects.filter(pk__lte=Post.objects.order_by('pk')[10].pk).update(
+            pub_date=timezone.now()
+        )
+        cls.expected = list(
+            Post.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+
+    def setUp(self):
+        self.client = Client()
+
+    def read_all(self, url, **params):
+        ids = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            ids += [post['id'] for post in data['results']]
+            if data['next'] is None:
+                return ids
+            response = self.client.get(data['next'])
+
+    def test_index_pages_follow_cursor(self):
+        """Курсор обходит ленту без пропусков и повторов."""
+        self.assertEqual(
+            self.read_all(reverse('posts:api_index'), limit=4),
+            self.expected,
+        )
+
+    def test_default_fields(self):
+        """По умолчанию отдаются id, дата, автор, группа и текст."""
+        response = self.client.get(reverse('posts:api_index'))
+        post = Post.objects.get(pk=self.expected[0])
+        data = response.json()
+        self.assertEqual(data['results'][0], {
+            'id': post.pk,
+            'pub_date': DjangoJSONEncoder().default(post.pub_date),
+            'author': post.author.username,
+            'group': post.group.slug if post.group else None,
+            'text': post.text,
+        })
+        self.assertEqual(len(data['results']), POSTS_PAGE)
+        self.assertIn('Пост номер'.encode(), response.content)
+
+    def test_fields_are_pushed_into_query(self):
+        """?fields= сужает SELECT и убирает ненужные JOIN."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('posts:api_index'), {'fields': 'title,id'}
+            )
+        self.assertEqual(
+            set(response.json()['results'][0]), {'title', 'id'}
+        )
+        sql, = [query['sql'] for query in queries.captured_queries]
+        self.assertNotIn('JOIN', sql)
+        self.assertNotIn('"text"', sql)
+
+    def test_group_and_profile_filter_feed(self):
+        """Ленты группы и автора содержат только свои посты."""
+        group_ids = self.read_all(
+            reverse('posts:api_group_list', args=(self.group.slug,)),
+            limit=3,
+        )
+        self.assertEqual(group_ids, [
+            pk for pk in self.expected
+            if Post.objects.get(pk=pk).group_id == self.group.pk
+        ])
+        author_ids = self.read_all(
+            reverse('posts:api_profile', args=(self.author.username,)),
+        )
+        self.assertEqual(author_ids, [
+            pk for pk in self.expected
+            if Post.objects.get(pk=pk).author_id == self.author.pk
+        ])
+        for url in (reverse('posts:api_group_list', args=('missing',)),
+                    reverse('posts:api_profile', args=('missing',))):
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_post_detail(self):
+        """Пост отдаётся с выбранными полями и поддерживает ETag."""
+        post = Post.objects.get(pk=self.expected[0])
+        url = reverse('posts:api_post_detail', args=(post.pk,))
+        response = self.client.get(url, {'fields': 'text_html,author'})
+        self.assertEqual(response.json(), {
+            'text_html': post.text_html, 'author': post.author.username,
+        })
+        response = self.client.get(
+            url, {'fields': 'text_html,author'},
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+        self.assertEqual(response.status_code, 304)
+        missing = reverse('posts:api_post_detail', args=(10 ** 6,))
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+    def test_rejects_bad_parameters(self):
+        """Неизвестное поле, неверные limit и cursor дают 400."""
+        url = reverse('posts:api_index')
+        for params in ({'fields': 'id,password'}, {'fields': ','},
+                       {'limit': '0'}, {'limit': '1000'}, {'limit': 'x'},
+                       {'cursor': 'broken'}, {'cursor': 'YWJj'}):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('detail', response.json())
+
+    def test_feed_page_is_one_query(self):
+        """Страница ленты читается одним запросом, ETag — без запросов."""
+        with self.assertQueryBudget(1):
+            self.client.get(reverse('posts:api_index'))
+        with self.assertQueryBudget(3):
+            self.client.get(
+                reverse('posts:api_profile', args=(self.author.username,))
+            )
@@ -0,0 +1,114 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from ..benchmark import percentile
+from ..models import Group, Post, User
+
+
+class BenchmarkCommandsTests(TestCase):
+    def test_seed_benchmark_skews_authors(self):
+        """seed_benchmark создаёт данные с перекосом в сторону первых."""
+        call_command(
+            'seed_benchmark', '--users', '5', '--groups', '3',
+            '--posts', '200', '--seed', '1', stdout=StringIO(),
+        )
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Group.objects.count(), 3)
+        self.assertEqual(Post.objects.count(), 200)
+        first, last = User.objects.order_by('pk')[::4]
+        self.assertGreater(first.posts.count(), last.posts.count())
+        self.assertGreater(
+            Post.objects.dates('pub_date', 'day').count(), 1
+        )
+
+    def test_run_benchmark_saves_report(self):
+        """run_benchmark сохраняет метрики по каждому view в JSON."""
+        call_command(
+            'seed_benchmark', '--users', '2', '--groups', '1',
+            '--posts', '20', '--seed', '1', stdout=StringIO(),
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'report.json')
+            call_command(
+                'run_benchmark', '--requests', '3', '--output', path,
+                stdout=StringIO(),
+            )
+            call_command(
+                'run_benchmark', '--requests', '3', '--baseline', path,
+                stdout=StringIO(),
+            )
+            with open(path, encoding='utf-8') as stream:
+                results = json.load(stream)['results']
+        self.assertEqual(set(results), {
+            'posts:index', 'posts:group_list', 'posts:profile',
+            'posts:post_detail', 'posts:post_create', 'posts:post_edit',
+            'posts:api_index', 'posts:api_group_list', 'posts:api_profile',
+            'posts:api_post_detail',
+        })
+        for summary in results.values():
+            self.assertEqual(summary['requests'], 3)
+            self.assertLessEqual(summary['p50_ms'], summary['p99_ms'])
+
+    def test_benchmark_templates_covers_posts_templates(self):
+        """benchmark_templates замеряет каждый шаблон из templates/posts."""
+        out = StringIO()
+        call_command('benchmark_templates', '--iterations', '2', stdout=out)
+        results = json.loads(out.getvalue())
+        self.assertEqual(set(results), {
+            'posts/create_post.html', 'posts/group_list.html',
+            'posts/includes/paginator.html', 'posts/index.html',
+            'posts/post_detail.html', 'posts/profile.html',
+            'posts/search.html',
+        })
+        for summary in results.values():
+            self.assertEqual(summary['renders'], 2)
+            self.assertGreater(summary['bytes'], 0)
+
+    def test_benchmark_admin_measures_changelist(self):
+        """benchmark_admin замеряет список и форму поста в админке."""
+        call_command(
+            'seed_benchmark', '--users', '2', '--groups', '3',
+            '--posts', '30', '--seed', '1', stdout=StringIO(),
+        )
+        out = StringIO()
+        call_command('benchmark_admin', '--requests', '2', stdout=out)
+        results = json.loads(out.getvalue())
+        self.assertEqual(set(results), {
+            'admin:posts_post_changelist',
+            'admin:posts_post_changelist:last_page',
+            'admin:posts_post_changelist:year',
+            'admin:posts_post_change',
+        })
+        for summary in results.values():
+            self.assertEqual(summary['requests'], 2)
+            self.assertGreater(summary['queries'], 0)
+            self.assertGreater(summary['bytes'], 1000)
+
+    def test_benchmark_asgi_compares_servers(self):
+        """benchmark_asgi прогоняет WSGI и ASGI с медленными клиентами."""
+        out = StringIO()
+        call_command(
+            'benchmark_asgi', '--path', reverse('about:author'),
+            '--duration', '0.3', '--threads', '1', '--slow', '2',
+            '--fast', '1', '--delay', '0.001', stdout=out,
+        )
+        report = json.loads(out.getvalue())
+        self.assertEqual(set(report), {'wsgi', 'asgi'})
+        for summary in report.values():
+            self.assertEqual(summary['errors'], 0)
+            self.assertGreater(summary['fast_requests'], 0)
+            self.assertIn('p99_ms', summary)
+        self.assertLessEqual(report['wsgi']['peak_connections'], 1)
+
+    def test_percentile_nearest_rank(self):
+        """Перцентиль считается по ближайшему рангу."""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 95), 7)
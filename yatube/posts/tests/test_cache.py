@@ -0,0 +1,146 @@
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Group, Post, User
+
+
+class PageCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Тестовый пост',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client_author = Client()
+        self.authorized_client_author.force_login(PageCacheTests.author)
+
+    def get_urls(self):
+        return (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.author}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        )
+
+    def test_anonymous_page_served_from_cache(self):
+        """Повторный анонимный запрос отдаётся из кэша."""
+        for url in self.get_urls():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                with self.assertNumQueries(1 if url != '/' else 0):
+                    cached_response = self.client.get(url)
+                self.assertEqual(response.content, cached_response.content)
+
+    def test_post_save_invalidates_pages(self):
+        """Изменение поста сбрасывает кэш связанных страниц."""
+        for url in self.get_urls():
+            self.client.get(url)
+        self.post.text = 'Изменённый текст поста'
+        self.post.save()
+        for url in self.get_urls():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, 'Изменённый текст поста')
+
+    def test_group_save_invalidates_pages(self):
+        """Переименование группы сбрасывает кэш страниц с ней."""
+        for url in self.get_urls():
+            self.client.get(url)
+        self.group.title = 'Новое название группы'
+        self.group.save()
+        for url in self.get_urls():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, 'Новое название группы')
+
+    def test_authorized_user_gets_personal_header(self):
+        """Авторизованный пользователь не получает анонимную копию."""
+        self.client.get(reverse('posts:index'))
+        response = self.authorized_client_author.get(reverse('posts:index'))
+        self.assertContains(response, f'Пользователь: {self.author}')
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Тестовый пост',
+            group=cls.group,
+        )
+
+    def get_urls(self):
+        return (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.author}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        )
+
+    def test_unchanged_page_returns_304(self):
+        """Страница без изменений отдаёт 304 по ETag."""
+        for url in self.get_urls():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertFalse(response.has_header('Last-Modified'))
+                response = self.client.get(
+                    url, HTTP_IF_NONE_MATCH=response['ETag']
+                )
+                self.assertEqual(
+                    response.status_code, HTTPStatus.NOT_MODIFIED
+                )
+
+    def test_edit_changes_validator(self):
+        """Редактирование поста меняет ETag страниц."""
+        etags = {url: self.client.get(url)['ETag'] for url in self.get_urls()}
+        self.post.text = 'Изменённый текст поста'
+        self.post.save()
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_delete_changes_validator(self):
+        """Удаление поста меняет ETag, If-Modified-Since не даёт 304."""
+        post = Post.objects.create(author=self.author, text='Удаляемый')
+        url = reverse('posts:index')
+        etag = self.client.get(url)['ETag']
+        post.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT'
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_index_validator_skips_posts_table(self):
+        """ETag главной не читает таблицу постов."""
+        self.client.get(reverse('posts:index'))
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse('posts:index'))
+        for query in context.captured_queries:
+            with self.subTest(sql=query['sql']):
+                self.assertNotIn('posts_post', query['sql'])
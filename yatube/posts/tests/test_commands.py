@@ -0,0 +1,23 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..management.commands.explain_feeds import uses_feed_index
+
+
+class ExplainFeedsCommandTests(TestCase):
+    def test_feeds_use_indexes(self):
+        """Все ленты читаются по составным индексам."""
+        out = StringIO()
+        call_command('explain_feeds', '--check', stdout=out)
+        for index in (
+            'post_feed_idx', 'post_group_feed_idx', 'post_author_feed_idx'
+        ):
+            with self.subTest(index=index):
+                self.assertIn(index, out.getvalue())
+
+    def test_full_scan_is_regression(self):
+        """Полный скан и временная сортировка считаются регрессией."""
+        self.assertFalse(uses_feed_index('SCAN posts_post'))
+        self.assertFalse(uses_feed_index('USE TEMP B-TREE FOR ORDER BY'))
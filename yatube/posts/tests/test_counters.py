@@ -0,0 +1,83 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import AuthorStats, Group, Post, User
+
+
+class PostCountersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.another_group = Group.objects.create(
+            title='Другая группа',
+            slug='another-slug',
+            description='Другое описание',
+        )
+
+    def setUp(self):
+        self.authorized_client_author = Client()
+        self.authorized_client_author.force_login(PostCountersTests.author)
+
+    def assertCounters(self, author_count, group_count, another_count):
+        self.author.stats.refresh_from_db()
+        self.group.refresh_from_db()
+        self.another_group.refresh_from_db()
+        self.assertEqual(self.author.stats.posts_count, author_count)
+        self.assertEqual(self.group.posts_count, group_count)
+        self.assertEqual(self.another_group.posts_count, another_count)
+
+    def test_counters_follow_create_edit_delete(self):
+        """Счётчики меняются при создании, смене группы и удалении."""
+        self.authorized_client_author.post(
+            reverse('posts:post_create'),
+            data={'text': 'Новый пост', 'group': self.group.pk},
+        )
+        self.assertCounters(1, 1, 0)
+        post = Post.objects.get(author=self.author)
+        self.authorized_client_author.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.pk}),
+            data={'text': 'Новый пост', 'group': self.another_group.pk},
+        )
+        self.assertCounters(1, 0, 1)
+        Post.objects.get(pk=post.pk).delete()
+        self.assertCounters(0, 0, 0)
+
+    def test_profile_shows_counter(self):
+        """Профиль берёт число постов из счётчика."""
+        Post.objects.create(author=self.author, text='Пост', group=self.group)
+        AuthorStats.objects.filter(author=self.author).update(posts_count=7)
+        response = self.client.get(
+            reverse('posts:profile', kwargs={'username': self.author})
+        )
+        self.assertEqual(response.context['posts_count'], 7)
+        self.assertEqual(response.context['page_obj'].paginator.count, 7)
+
+    def test_bulk_create_updates_counters(self):
+        """bulk_create увеличивает счётчики одной пачкой."""
+        Post.objects.bulk_create(
+            Post(author=self.author, text=f'Пост {i}', group=self.group)
+            for i in range(3)
+        )
+        self.assertCounters(3, 3, 0)
+
+    def test_recount_posts_repairs_counters(self):
+        """Команда recount_posts восстанавливает разошедшиеся счётчики."""
+        Post.objects.bulk_create(
+            Post(author=self.author, text=f'Пост {i}', group=self.group)
+            for i in range(3)
+        )
+        AuthorStats.objects.update(posts_count=0)
+        Group.objects.update(posts_count=5)
+        out = StringIO()
+        call_command('recount_posts', stdout=out)
+        self.assertIn('Счётчики постов пересчитаны.', out.getvalue())
+        self.assertCounters(3, 3, 0)
@@ -0,0 +1,114 @@
+import json
+import os
+import tempfile
+from datetime import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import AuthorStats, Group, Post, User
+
+
+class PostExchangeCommandsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write_jsonl(self, records):
+        path = os.path.join(self.directory, 'posts.jsonl')
+        with open(path, 'w', encoding='utf-8') as stream:
+            for record in records:
+                stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return path
+
+    def test_import_posts_in_batches(self):
+        """import_posts грузит посты пачками и сохраняет даты."""
+        path = self.write_jsonl([
+            {
+                'text': f'Импортированный пост {i}',
+                'pub_date': '2020-01-0{}T10:00:00+00:00'.format(i + 1),
+                'author': self.author.username,
+                'group': self.group.slug if i % 2 else '',
+            }
+            for i in range(5)
+        ] + [
+            {'text': 'Чужой пост', 'author': 'nobody', 'group': ''},
+        ])
+        call_command(
+            'import_posts', path, '--batch-size', '2', stdout=StringIO()
+        )
+        posts = Post.objects.order_by('pub_date')
+        self.assertEqual(posts.count(), 5)
+        self.assertEqual(
+            posts.first().pub_date,
+            timezone.make_aware(datetime(2020, 1, 1, 10), timezone.utc),
+        )
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.author).posts_count, 5
+        )
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, 2)
+        self.assertTrue(Post._meta.get_field('pub_date').auto_now_add)
+
+    def test_import_skips_malformed_records(self):
+        """Испорченные записи пропускаются и не прерывают импорт."""
+        author = self.author.username
+        path = self.write_jsonl([
+            {'text': 'Хороший пост', 'author': author},
+            {'author': author},
+            {'text': ['не строка'], 'author': author},
+            {'text': 'Без даты', 'author': author, 'pub_date': 'not-a-date'},
+            {
+                'text': 'Вне диапазона',
+                'author': author,
+                'pub_date': '2024-13-45T10:00:00',
+            },
+            {'text': 'Автор списком', 'author': [author]},
+            ['не', 'словарь'],
+            {'text': 'Последний пост', 'author': author},
+        ])
+        with open(path, 'a', encoding='utf-8') as stream:
+            stream.write('{"text": "оборванная строка\n')
+        out = StringIO()
+        call_command('import_posts', path, '--batch-size', '3', stdout=out)
+        self.assertEqual(
+            sorted(Post.objects.values_list('text', flat=True)),
+            ['Последний пост', 'Хороший пост'],
+        )
+        self.assertIn('Загружено постов: 2, пропущено: 7.', out.getvalue())
+
+    def test_export_import_round_trip(self):
+        """Выгрузка в CSV загружается обратно без потерь."""
+        Post.objects.create(
+            author=self.author, text='Пост, с "кавычками"\nи строкой',
+            group=self.group,
+        )
+        Post.objects.create(author=self.author, text='Пост без группы')
+        path = os.path.join(self.directory, 'posts.csv')
+        call_command('export_posts', path, '--chunk-size', '1')
+        expected = list(
+            Post.objects.order_by('pk')
+            .values_list('text', 'pub_date', 'group')
+        )
+        Post.objects.all().delete()
+        call_command('import_posts', path, stdout=StringIO())
+        self.assertEqual(
+            list(
+                Post.objects.order_by('pk')
+                .values_list('text', 'pub_date', 'group')
+            ),
+            expected,
+        )
@@ -0,0 +1,120 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from ..constants import CLS_CYCLE
+from ..models import Group, Post, User
+from ..timelines import rebuild_timelines
+from .utils import QueryBudgetMixin, run_commit_hooks
+
+# Бюджет запросов для анонимного пользователя при промахе кэша страниц
+# и построенных лентах: валидатор для условного GET, поиск версии кэша,
+# загрузка постов страницы по id и, где нужно, группы или автора. Число
+# постов берётся из денормализованных счётчиков или из ленты, без
+# COUNT(*).
+FEED_QUERY_BUDGETS = {
+    'posts:index': 2,
+    'posts:group_list': 4,
+    'posts:profile': 4,
+}
+
+
+class FeedQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for i in range(CLS_CYCLE):
+            author = User.objects.create_user(username=f'author_{i}')
+            group = Group.objects.create(
+                title=f'Группа {i}',
+                slug=f'group-{i}',
+                description='Описание',
+            )
+            Post.objects.create(author=author, group=group, text=f'Пост {i}')
+        Post.objects.bulk_create(
+            Post(author=cls.author, group=cls.group, text=f'Текст {i}')
+            for i in range(CLS_CYCLE)
+        )
+        run_commit_hooks()
+
+    def setUp(self):
+        self.clear_page_cache()
+
+    def clear_page_cache(self):
+        cache.clear()
+        rebuild_timelines()
+
+    def get_urls(self):
+        return {
+            'posts:index': reverse('posts:index'),
+            'posts:group_list': reverse(
+                'posts:group_list', kwargs={'slug': self.group.slug}
+            ),
+            'posts:profile': reverse(
+                'posts:profile', kwargs={'username': self.author.username}
+            ),
+        }
+
+    def test_feeds_stay_within_query_budget(self):
+        """Ленты укладываются в бюджет запросов на каждой странице."""
+        for name, url in self.get_urls().items():
+            for page in (1, 2):
+                with self.subTest(name=name, page=page):
+                    with self.assertQueryBudget(FEED_QUERY_BUDGETS[name]):
+                        self.client.get(url, {'page': page})
+                    with self.assertQueryBudget(2):
+                        self.client.get(url, {'page': page})
+
+    def test_feed_loads_authors_and_groups(self):
+        """Автор и группа поста загружены вместе с лентой."""
+        response = self.client.get(reverse('posts:index'))
+        for post in response.context['page_obj']:
+            with self.subTest(post=post.pk):
+                with self.assertNumQueries(0):
+                    post.author.get_full_name()
+                    post.group.slug
+
+    def test_feeds_skip_large_columns(self):
+        """Ленты не читают полный текст, описание групп и пароли."""
+        large_columns = (
+            '"posts_post"."text"',
+            '"posts_post"."text_html"',
+            '"posts_group"."description"',
+            '"auth_user"."password"',
+        )
+        for name, url in self.get_urls().items():
+            with self.subTest(name=name):
+                self.clear_page_cache()
+                with self.assertQueryBudget(
+                    FEED_QUERY_BUDGETS[name]
+                ) as context:
+                    self.client.get(url)
+                feed_sql = [
+                    query['sql'] for query in context.captured_queries
+                    if query['sql'].startswith('SELECT "posts_post"')
+                ]
+                self.assertEqual(len(feed_sql), 1)
+                for column in large_columns:
+                    self.assertNotIn(column, feed_sql[0])
+
+    def test_profile_header_reads_projection(self):
+        """Шапка профиля читает только нужные столбцы автора."""
+        with self.assertQueryBudget(
+            FEED_QUERY_BUDGETS['posts:profile']
+        ) as context:
+            response = self.client.get(self.get_urls()['posts:profile'])
+        author_sql = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT "auth_user"')
+            and '"posts_authorstats"' in query['sql']
+        ]
+        self.assertEqual(len(author_sql), 1)
+        for column in ('password', 'email', 'last_login', 'date_joined'):
+            self.assertNotIn(f'"auth_user"."{column}"', author_sql[0])
+        self.assertEqual(response.context['posts_count'], CLS_CYCLE)
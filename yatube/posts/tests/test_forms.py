@@ -1,6 +1,9 @@
 from http import HTTPStatus
 
+from django.core.cache import cache
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from ..forms import PostForm
@@ -86,3 +89,76 @@ class PostCreateFormTests(TestCase):
             self.post.author,
             'ошибка с автором поста при редактировании'
         )
+
+
+class PostFormGroupChoicesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def add_groups(self, count):
+        start = Group.objects.count()
+        Group.objects.bulk_create(
+            Group(title=f'Группа {i}', slug=f'group-{i}', description='-')
+            for i in range(start, start + count)
+        )
+
+    def test_group_choices_do_not_hit_database(self):
+        """Форма выводит и проверяет группы без запросов к posts_group."""
+        PostForm().as_p()
+        with self.assertNumQueries(0):
+            form = PostForm({'text': 'Текст', 'group': self.group.pk})
+            self.assertIn(self.group.title, form.as_p())
+            self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['group'], self.group)
+
+    def test_post_create_queries_do_not_grow(self):
+        """Число запросов post_create не зависит от числа групп."""
+        url = reverse('posts:post_create')
+        budgets = {}
+        for count in (1, 50):
+            self.add_groups(count)
+            cache.clear()
+            self.authorized_client.get(url)
+            self.authorized_client.post(
+                url, {'text': 'Текст', 'group': self.group.pk}
+            )
+            with CaptureQueriesContext(connection) as get_context:
+                self.authorized_client.get(url)
+            with CaptureQueriesContext(connection) as post_context:
+                self.authorized_client.post(
+                    url, {'text': 'Текст', 'group': self.group.pk}
+                )
+            budgets[count] = (len(get_context), len(post_context))
+        self.assertEqual(budgets[1], budgets[50])
+
+    def test_group_choices_follow_group_changes(self):
+        """Новая группа сразу доступна, удалённая отклоняется."""
+        PostForm().as_p()
+        group = Group.objects.create(
+            title='Новая группа', slug='new', description='-'
+        )
+        self.assertIn('Новая группа', PostForm().as_p())
+        group_id = group.pk
+        group.delete()
+        form = PostForm({'text': 'Текст', 'group': group_id})
+        self.assertFalse(form.is_valid())
+        self.assertIn('group', form.errors)
+
+    def test_invalid_group_rejected(self):
+        """Неизвестный или нечисловой id группы не проходит проверку."""
+        for value in ('abc', '999', '1.5'):
+            with self.subTest(value=value):
+                form = PostForm({'text': 'Текст', 'group': value})
+                self.assertFalse(form.is_valid())
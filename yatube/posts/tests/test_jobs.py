@@ -0,0 +1,214 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .. import jobs
+from ..constants import POST_JOBS_MAX_ATTEMPTS
+from ..jobs import (
+    SEARCH_INDEX_JOB, SEARCH_INDEX_RANGE_JOB, claim_jobs, enqueue,
+    process_jobs, run_jobs,
+)
+from ..models import Post, PostJob, User
+from ..search import SearchResults
+
+
+class PostJobTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestAuthor')
+
+    def setUp(self):
+        PostJob.objects.all().delete()
+
+    def test_post_write_enqueues_search_index(self):
+        """Запись поста ставит одну задачу индексации, а не индексирует."""
+        post = Post.objects.create(author=self.author, text='Про котиков')
+        post.text = 'Про собак'
+        post.save()
+        job = PostJob.objects.get()
+        self.assertEqual((job.kind, job.key), (SEARCH_INDEX_JOB, str(post.pk)))
+        self.assertEqual(job.version, 1)
+        self.assertEqual(SearchResults('собак').count(), 0)
+        self.assertEqual(run_jobs(), 1)
+        self.assertEqual(SearchResults('собак').count(), 1)
+        self.assertFalse(PostJob.objects.exists())
+
+    def test_save_without_text_skips_index(self):
+        """save(update_fields) без text не ставит задачу."""
+        post = Post.objects.create(author=self.author, text='Про котиков')
+        run_jobs()
+        post.save(update_fields=('pub_date',))
+        self.assertFalse(PostJob.objects.exists())
+
+    def test_bulk_create_enqueues_one_job(self):
+        """bulk_create ставит одну задачу на диапазон вставленных id."""
+        Post.objects.create(author=self.author, text='Первый котик')
+        run_jobs()
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM posts_post_fts')
+        posts = Post.objects.bulk_create(
+            Post(author=self.author, text=f'Котик {i}') for i in range(5)
+        )
+        job = PostJob.objects.get()
+        self.assertEqual(job.kind, SEARCH_INDEX_RANGE_JOB)
+        self.assertEqual(job.key, f'{posts[0].pk}-{posts[-1].pk}')
+        run_jobs()
+        self.assertEqual(SearchResults('котик').count(), 5)
+
+    def test_bulk_create_range_covers_posts_without_pk(self):
+        """Посты без известных id попадают в диапазон до нового максимума."""
+        first = Post.objects.create(author=self.author, text='Первый')
+        run_jobs()
+        Post.objects.bulk_create([
+            Post(pk=10 ** 6, author=self.author, text='Котик с id'),
+            Post(author=self.author, text='Котик без id'),
+        ])
+        self.assertEqual(
+            set(PostJob.objects.values_list('key', flat=True)),
+            {f'{10 ** 6}-{10 ** 6}', f'{first.pk + 1}-{10 ** 6 + 1}'},
+        )
+        run_jobs()
+        self.assertEqual(SearchResults('котик').count(), 2)
+
+    def test_jobs_of_one_kind_run_in_one_batch(self):
+        """Задачи одного типа передаются обработчику одним вызовом."""
+        handler = mock.Mock()
+        enqueue('test', (1, 2, 3))
+        with mock.patch.dict(jobs.JOB_HANDLERS, {'test': handler}):
+            self.assertEqual(process_jobs(), 3)
+        handler.assert_called_once_with(['1', '2', '3'])
+        self.assertFalse(PostJob.objects.exists())
+
+    def test_job_enqueued_while_running_is_kept(self):
+        """Задача, поставленная заново во время выполнения, остаётся."""
+        def handler(keys):
+            enqueue('test', keys)
+
+        enqueue('test', (1,))
+        with mock.patch.dict(jobs.JOB_HANDLERS, {'test': handler}):
+            process_jobs()
+        job = PostJob.objects.get()
+        self.assertEqual((job.version, job.lease), (1, ''))
+        self.assertIsNone(job.locked_until)
+
+    def test_failed_job_is_retried_after_lease(self):
+        """Упавшая задача остаётся в outbox и берётся после аренды."""
+        handler = mock.Mock(side_effect=ValueError('сбой'))
+        enqueue('test', (1,))
+        with mock.patch.dict(jobs.JOB_HANDLERS, {'test': handler}), \
+                self.assertLogs('posts.jobs', 'ERROR'):
+            process_jobs()
+        job = PostJob.objects.get()
+        self.assertIn('сбой', job.last_error)
+        self.assertEqual(claim_jobs(10), [])
+        PostJob.objects.update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        handler.side_effect = None
+        with mock.patch.dict(jobs.JOB_HANDLERS, {'test': handler}):
+            self.assertEqual(run_jobs(), 1)
+        self.assertEqual(handler.call_count, 2)
+        self.assertFalse(PostJob.objects.exists())
+
+    def test_in_process_worker_runs_after_commit(self):
+        """После коммита задачи разбирает фоновый поток процесса."""
+        worker = jobs.InProcessWorker()
+        with mock.patch.object(jobs, 'worker', worker), \
+                override_settings(POST_JOBS_IN_PROCESS=True), \
+                mock.patch.object(jobs.transaction, 'on_commit') as on_commit:
+            enqueue('test', (1,))
+        on_commit.assert_called_once_with(worker.wake_up)
+        with mock.patch.object(jobs.transaction, 'on_commit') as on_commit:
+            enqueue('test', (1,))
+        on_commit.assert_not_called()
+        with mock.patch.object(jobs, 'run_jobs') as run, \
+                mock.patch.object(jobs, 'connection'), \
+                mock.patch.object(jobs, 'POST_JOBS_IDLE_SECONDS', 0.1):
+            worker.wake_up()
+            thread = worker.thread
+            thread.join(1)
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(worker.thread)
+        run.assert_called_once_with()
+
+    def test_wake_up_during_idle_timeout_is_kept(self):
+        """Пробуждение после таймаута ожидания не теряется."""
+        worker = jobs.InProcessWorker()
+        worker.thread = mock.Mock()
+
+        def timed_out(timeout):
+            worker.event.set()
+            return False
+
+        with mock.patch.object(worker.event, 'wait', side_effect=timed_out):
+            self.assertTrue(worker.wait())
+        self.assertIsNotNone(worker.thread)
+        with mock.patch.object(worker.event, 'wait', return_value=False):
+            self.assertFalse(worker.wait())
+        self.assertIsNone(worker.thread)
+
+    def test_failed_job_does_not_block_batch(self):
+        """Если пачка упала, задачи повторяются по одной."""
+        def handler(keys):
+            if '2' in keys:
+                raise ValueError('сбой')
+
+        enqueue('test', (1, 2, 3))
+        with mock.patch.dict(jobs.JOB_HANDLERS, {'test': handler}), \
+                self.assertLogs('posts.jobs', 'ERROR'):
+            self.assertEqual(process_jobs(), 3)
+        job = PostJob.objects.get()
+        self.assertEqual(job.key, '2')
+        self.assertIn('сбой', job.last_error)
+
+    def test_job_quarantined_after_max_attempts(self):
+        """Задача, исчерпавшая попытки, откладывается до --retry-failed."""
+        handler = mock.Mock(side_effect=ValueError('сбой'))
+        enqueue('test', (1,))
+        with mock.patch.dict(jobs.JOB_HANDLERS, {'test': handler}), \
+                self.assertLogs('posts.jobs', 'ERROR') as logs:
+            for _ in range(POST_JOBS_MAX_ATTEMPTS + 1):
+                PostJob.objects.update(locked_until=None)
+                process_jobs()
+        self.assertEqual(handler.call_count, POST_JOBS_MAX_ATTEMPTS)
+        self.assertIn('отложена', logs.output[-1])
+        out = StringIO()
+        handler.side_effect = None
+        with mock.patch.dict(jobs.JOB_HANDLERS, {'test': handler}):
+            call_command(
+                'run_post_jobs', '--retry-failed', '--once', stdout=out
+            )
+        self.assertFalse(PostJob.objects.exists())
+        self.assertIn('Возвращено задач: 1.', out.getvalue())
+        self.assertEqual(handler.call_count, POST_JOBS_MAX_ATTEMPTS + 1)
+
+    def test_run_post_jobs_command(self):
+        """Команда run_post_jobs --once разбирает outbox."""
+        Post.objects.create(author=self.author, text='Про котиков')
+        out = StringIO()
+        call_command('run_post_jobs', '--once', stdout=out)
+        self.assertIn('Выполнено задач: 1', out.getvalue())
+        self.assertEqual(SearchResults('котиков').count(), 1)
+
+
+class InProcessWorkerTests(TransactionTestCase):
+    def test_worker_thread_runs_jobs(self):
+        """Поток воркера сам выполняет задачи после коммита поста."""
+        author = User.objects.create_user(username='TestAuthor')
+        worker = jobs.InProcessWorker()
+        with mock.patch.object(jobs, 'worker', worker), \
+                mock.patch.object(jobs, 'POST_JOBS_IDLE_SECONDS', 0.1), \
+                override_settings(POST_JOBS_IN_PROCESS=True):
+            with transaction.atomic():
+                Post.objects.create(author=author, text='Про котиков')
+            thread = worker.thread
+            thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(PostJob.objects.exists())
+        self.assertEqual(SearchResults('котиков').count(), 1)
@@ -1,7 +1,8 @@
 from django.test import TestCase
 
 from ..models import Group, Post, User
-from ..constants import POSTS_SYMBOLS
+from ..constants import FEED_EXCERPT_SYMBOLS, POSTS_SYMBOLS
+from ..feeds import get_feed
 
 
 class PostModelTest(TestCase):
@@ -54,6 +55,66 @@ class PostModelTest(TestCase):
                     post._meta.get_field(field).help_text, expected_value)
 
 
+class PostRenderedTextTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    def test_rendered_fields_follow_text(self):
+        """HTML, отрывок и заголовок пересчитываются при сохранении."""
+        post = Post.objects.create(
+            author=self.user, text='Первый <b>\n\nпост'
+        )
+        self.assertEqual(
+            post.text_html, '<p>Первый &lt;b&gt;</p>\n\n<p>пост</p>'
+        )
+        self.assertEqual(post.title, 'Первый <b>\n\nпост')
+        post.text = 'Очень длинный текст ' * 50
+        post.save(update_fields=['text'])
+        post.refresh_from_db()
+        self.assertEqual(len(post.title), 30)
+        self.assertTrue(post.title.endswith('…'))
+        self.assertIn(post.text.strip(), post.text_html)
+        self.assertLess(len(post.excerpt_html), len(post.text_html))
+        self.assertIn('…', post.excerpt_html)
+
+    def test_bulk_create_renders_text(self):
+        """bulk_create заполняет вычисляемые поля."""
+        Post.objects.bulk_create(
+            [Post(author=self.user, text='Пакетный пост')]
+        )
+        post = Post.objects.get()
+        self.assertEqual(post.excerpt_html, '<p>Пакетный пост</p>')
+        self.assertEqual(post.title, 'Пакетный пост')
+
+    def test_bulk_create_sets_pks(self):
+        """bulk_create проставляет id, только если ни один не задан."""
+        posts = Post.objects.bulk_create(
+            Post(author=self.user, text=f'Пост {i}') for i in range(2)
+        )
+        self.assertEqual(
+            [post.pk for post in posts],
+            list(Post.objects.order_by('pk').values_list('pk', flat=True)),
+        )
+        posts = Post.objects.bulk_create([
+            Post(pk=10 ** 6, author=self.user, text='С id'),
+            Post(author=self.user, text='Без id'),
+        ])
+        self.assertEqual([post.pk for post in posts], [10 ** 6, None])
+
+    def test_feed_defers_full_text(self):
+        """Лента не загружает полный текст и его HTML."""
+        Post.objects.create(
+            author=self.user, text='а' * FEED_EXCERPT_SYMBOLS * 2
+        )
+        post = get_feed().get()
+        self.assertLessEqual({'text', 'text_html'}, post.get_deferred_fields())
+        with self.assertNumQueries(0):
+            self.assertEqual(str(post), 'а' * POSTS_SYMBOLS)
+            self.assertEqual(len(post.excerpt_html), FEED_EXCERPT_SYMBOLS + 7)
+
+
 class GroupModelTest(TestCase):
     @classmethod
     def setUpClass(cls):
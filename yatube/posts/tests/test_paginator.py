@@ -0,0 +1,71 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..constants import POSTS_PAGE
+from ..models import Group, Post, User
+from ..utils import WindowedPaginator
+
+ELLIPSIS = WindowedPaginator.ELLIPSIS
+
+
+class WindowedPaginatorTests(TestCase):
+    def get_range(self, number, num_pages=50):
+        paginator = WindowedPaginator(range(num_pages), 1)
+        return list(paginator.get_elided_page_range(number))
+
+    def test_short_feed_lists_every_page(self):
+        """Короткая лента выводит все страницы без пропусков."""
+        self.assertEqual(self.get_range(3, num_pages=7), list(range(1, 8)))
+
+    def test_window_around_current_page(self):
+        """Выводятся крайние страницы и окно вокруг текущей."""
+        cases = {
+            1: [1, 2, 3, ELLIPSIS, 50],
+            5: [1, 2, 3, 4, 5, 6, 7, ELLIPSIS, 50],
+            25: [1, ELLIPSIS, 23, 24, 25, 26, 27, ELLIPSIS, 50],
+            50: [1, ELLIPSIS, 48, 49, 50],
+        }
+        for number, expected in cases.items():
+            with self.subTest(number=number):
+                self.assertEqual(self.get_range(number), expected)
+
+    def test_window_size_is_bounded(self):
+        """Длина списка страниц не зависит от размера ленты."""
+        for num_pages in (100, 10000):
+            with self.subTest(num_pages=num_pages):
+                self.assertEqual(
+                    len(self.get_range(num_pages // 2, num_pages)), 9
+                )
+
+
+class PaginatorTemplateTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(text=f'Пост {i}', author=cls.author, group=cls.group)
+            for i in range(POSTS_PAGE * 20)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_template_renders_elided_range(self):
+        """Навигация выводит окно страниц вместо полного списка."""
+        response = self.client.get(
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            {'page': 10},
+        )
+        page_obj = response.context['page_obj']
+        self.assertEqual(page_obj.paginator.num_pages, 20)
+        self.assertContains(response, ELLIPSIS, count=2)
+        self.assertContains(response, 'page=20')
+        self.assertNotContains(response, 'page=15"')
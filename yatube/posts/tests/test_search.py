@@ -0,0 +1,85 @@
+from io import StringIO
+
+from django.contrib.admin.sites import site
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from ..constants import CLS_CYCLE, POSTS_PAGE
+from ..jobs import run_jobs
+from ..models import Group, Post, User
+from ..search import build_match_query
+
+
+class PostSearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Пост про Котиков и собак',
+            group=cls.group,
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.author, text=f'Котик номер {i}')
+            for i in range(CLS_CYCLE)
+        )
+        run_jobs()
+
+    def search(self, query, **params):
+        return self.client.get(reverse('posts:search'), {'q': query, **params})
+
+    def test_search_finds_posts_by_prefix(self):
+        """Поиск находит посты по началу слова без учёта регистра."""
+        response = self.search('собак')
+        self.assertEqual(list(response.context['page_obj']), [self.post])
+        response = self.search('котик')
+        self.assertEqual(response.context['page_obj'].paginator.count,
+                         CLS_CYCLE + 1)
+        self.assertEqual(len(response.context['page_obj']), POSTS_PAGE)
+
+    def test_search_follows_edit_and_delete(self):
+        """Индекс обновляется задачами после изменения и удаления поста."""
+        self.post.text = 'Пост про попугаев'
+        self.post.save()
+        self.assertEqual(len(self.search('собак').context['page_obj']), 1)
+        run_jobs()
+        self.assertEqual(len(self.search('собак').context['page_obj']), 0)
+        self.assertEqual(len(self.search('попугаев').context['page_obj']), 1)
+        self.post.delete()
+        run_jobs()
+        self.assertEqual(len(self.search('попугаев').context['page_obj']), 0)
+
+    def test_search_escapes_query_syntax(self):
+        """Кавычки и операторы FTS5 в запросе не ломают поиск."""
+        self.assertEqual(build_match_query('  '), '')
+        self.assertEqual(build_match_query('a"b OR'), '"a""b"* "OR"*')
+        response = self.search('"собак" AND (')
+        self.assertEqual(len(response.context['page_obj']), 0)
+
+    def test_rebuild_search_index(self):
+        """Команда rebuild_search_index восстанавливает индекс."""
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM posts_post_fts')
+        self.assertEqual(len(self.search('собак').context['page_obj']), 0)
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('Поисковый индекс перестроен.', out.getvalue())
+        self.assertEqual(len(self.search('собак').context['page_obj']), 1)
+
+    def test_admin_uses_search_index(self):
+        """Поиск в админке идёт через индекс FTS5."""
+        admin = site._registry[Post]
+        request = RequestFactory().get('/admin/posts/post/')
+        queryset, use_distinct = admin.get_search_results(
+            request, Post.objects.all(), 'собак'
+        )
+        self.assertIn('posts_post_fts', str(queryset.query))
+        self.assertEqual(list(queryset), [self.post])
@@ -0,0 +1,231 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.tests.utils import REPLICA
+
+from ..constants import POSTS_PAGE
+from ..feeds import get_feed
+from ..models import Group, Post, User
+from ..timelines import (
+    LocalTimelineBackend, author_timeline, get_backend, group_timeline,
+    index_timeline,
+)
+from .utils import QueryBudgetMixin, run_commit_hooks
+
+
+class TimelineTests(QueryBudgetMixin, TestCase):
+    databases = {'default', REPLICA}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.another_group = Group.objects.create(
+            title='Другая группа',
+            slug='another-slug',
+            description='Другое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def create_posts(self, count, **kwargs):
+        posts = [
+            Post.objects.create(author=self.author, text=f'Пост {i}', **kwargs)
+            for i in range(count)
+        ]
+        run_commit_hooks()
+        return posts
+
+    def get_ids(self, timeline):
+        entries, _ = timeline.get_state()
+        return [post_id for _, post_id in entries]
+
+    def get_stored_ids(self, timeline):
+        entries, _ = get_backend().get(timeline.key)
+        return [post_id for _, post_id in entries]
+
+    def test_timelines_follow_create_edit_delete(self):
+        """Ленты обновляются при создании, смене группы и удалении."""
+        self.assertEqual(self.get_ids(index_timeline()), [])
+        first, second = self.create_posts(2, group=self.group)
+        self.assertEqual(
+            self.get_ids(index_timeline()), [second.pk, first.pk]
+        )
+        self.assertEqual(
+            self.get_ids(group_timeline(self.group.pk)),
+            [second.pk, first.pk],
+        )
+        first.group = self.another_group
+        first.save()
+        run_commit_hooks()
+        self.assertEqual(
+            self.get_ids(group_timeline(self.group.pk)), [second.pk]
+        )
+        self.assertEqual(
+            self.get_ids(group_timeline(self.another_group.pk)), [first.pk]
+        )
+        second.delete()
+        run_commit_hooks()
+        self.assertEqual(self.get_ids(index_timeline()), [first.pk])
+        self.assertEqual(
+            self.get_ids(author_timeline(self.author.pk)), [first.pk]
+        )
+
+    def test_page_hydrated_by_ids(self):
+        """Страница ленты загружается одним запросом id__in."""
+        self.create_posts(POSTS_PAGE + 3, group=self.group)
+        self.client.force_login(self.author)
+        url = reverse('posts:group_list', kwargs={'slug': self.group.slug})
+        self.client.get(url)
+        with self.assertQueryBudget(10) as context:
+            response = self.client.get(url, {'page': 2})
+        feed_sql = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT "posts_post"."id"')
+        ]
+        self.assertEqual(len(feed_sql), 1)
+        self.assertIn('"posts_post"."id" IN', feed_sql[0])
+        self.assertNotIn('ORDER BY', feed_sql[0])
+        self.assertEqual(
+            list(response.context['page_obj']),
+            list(get_feed(group=self.group)[POSTS_PAGE:]),
+        )
+
+    @mock.patch('posts.timelines.TIMELINE_LENGTH', 3)
+    def test_pages_past_timeline_read_database(self):
+        """Ленты ограничены, страницы за их пределами читаются из базы."""
+        self.create_posts(POSTS_PAGE * 2)
+        self.assertEqual(len(self.get_ids(index_timeline())), 3)
+        response = self.client.get(reverse('posts:index'), {'page': 2})
+        self.assertEqual(
+            list(response.context['page_obj']),
+            list(get_feed()[POSTS_PAGE:POSTS_PAGE * 2]),
+        )
+
+    @mock.patch('posts.timelines.TIMELINE_LENGTH', 3)
+    def test_old_entry_added_only_to_complete_timeline(self):
+        """Старый пост попадает только в ленту, где есть все посты."""
+        posts = self.create_posts(4, group=self.group)
+        self.create_posts(1, group=self.another_group)
+        old_entry = (posts[0].pub_date - timedelta(days=1), 10 ** 6)
+        truncated = group_timeline(self.group.pk)
+        complete = group_timeline(self.another_group.pk)
+        for timeline in (truncated, complete):
+            timeline.rebuild()
+            timeline.add(old_entry)
+        self.assertNotIn(old_entry[1], self.get_ids(truncated))
+        self.assertEqual(self.get_ids(complete)[-1], old_entry[1])
+        self.assertEqual(truncated.get_state()[1], 5)
+
+    def test_changes_applied_after_commit(self):
+        """До коммита лента читается из базы, откат её не меняет."""
+        timeline = index_timeline()
+        self.assertEqual(self.get_ids(timeline), [])
+        with transaction.atomic():
+            post = Post.objects.create(author=self.author, text='Пост')
+            self.assertEqual(self.get_ids(timeline), [post.pk])
+            self.assertEqual(self.get_stored_ids(timeline), [])
+            transaction.set_rollback(True)
+        run_commit_hooks()
+        self.assertEqual(self.get_stored_ids(timeline), [])
+        post = self.create_posts(1)[0]
+        self.assertEqual(self.get_stored_ids(timeline), [post.pk])
+
+    def test_index_skips_count(self):
+        """Число постов главной берётся из ленты, без COUNT(*)."""
+        self.create_posts(POSTS_PAGE + 1)
+        self.get_ids(index_timeline())
+        with self.assertQueryBudget(10) as context:
+            response = self.client.get(reverse('posts:index'), {'page': 2})
+        paginator = response.context['page_obj'].paginator
+        self.assertEqual(paginator.count, POSTS_PAGE + 1)
+        for query in context.captured_queries:
+            self.assertNotIn('COUNT(', query['sql'])
+
+    def test_locked_timeline_not_stored(self):
+        """Занятая правкой лента читается из базы, но не сохраняется."""
+        timeline = index_timeline()
+        with get_backend().lock(timeline.key):
+            self.assertEqual(self.get_ids(timeline), [])
+        self.assertIsNone(get_backend().get(timeline.key))
+
+    @override_settings(DATABASE_REPLICAS=[REPLICA])
+    def test_timeline_not_built_from_replica(self):
+        """Лента строится по primary, даже если страница читает реплику."""
+        post = self.create_posts(1)[0]
+        self.client.get(reverse('posts:index'))
+        self.assertEqual(self.get_stored_ids(index_timeline()), [post.pk])
+
+    def test_stale_entry_resets_timeline(self):
+        """Id поста, которого нет в базе, сбрасывает ленту."""
+        post = self.create_posts(1)[0]
+        timeline = index_timeline()
+        self.get_ids(timeline)
+        timeline.add((post.pub_date + timedelta(days=1), 10 ** 6))
+        response = self.client.get(reverse('posts:index'))
+        self.assertEqual(list(response.context['page_obj']), [post])
+        self.assertIsNone(get_backend().get(timeline.key))
+
+    def test_bulk_create_resets_timelines(self):
+        """bulk_create сбрасывает ленты, и они перестраиваются."""
+        self.get_ids(index_timeline())
+        Post.objects.bulk_create(
+            Post(author=self.author, group=self.group, text=f'Пост {i}')
+            for i in range(3)
+        )
+        run_commit_hooks()
+        self.assertIsNone(get_backend().get(index_timeline().key))
+        self.assertEqual(
+            self.get_ids(group_timeline(self.group.pk)),
+            [post.pk for post in get_feed(group=self.group)],
+        )
+
+    @override_settings(
+        TIMELINE_BACKEND='posts.timelines.LocalTimelineBackend'
+    )
+    def test_local_backend(self):
+        """Ленты можно держать в памяти процесса."""
+        self.assertIsInstance(get_backend(), LocalTimelineBackend)
+        post = self.create_posts(1)[0]
+        self.assertEqual(self.get_ids(index_timeline()), [post.pk])
+        cache.clear()
+        self.assertIsNotNone(get_backend().get(index_timeline().key))
+
+    @override_settings(TIMELINE_AUTHORS=False)
+    def test_author_timelines_optional(self):
+        """Ленты авторов можно отключить."""
+        post = self.create_posts(1)[0]
+        self.assertIsNone(author_timeline(self.author.pk))
+        response = self.client.get(
+            reverse('posts:profile', kwargs={'username': self.author})
+        )
+        self.assertEqual(list(response.context['page_obj']), [post])
+
+    def test_rebuild_command(self):
+        """rebuild_timelines перестраивает ленты главной, групп и авторов."""
+        self.create_posts(2, group=self.group)
+        cache.clear()
+        out = StringIO()
+        call_command('rebuild_timelines', stdout=out)
+        self.assertIn('Перестроено лент: 3.', out.getvalue())
+        for timeline in (
+            index_timeline(),
+            group_timeline(self.group.pk),
+            author_timeline(self.author.pk),
+        ):
+            with self.subTest(timeline=timeline.name):
+                self.assertIsNotNone(get_backend().get(timeline.key))
@@ -1,5 +1,8 @@
 from django import forms
+from django.core.cache import cache
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from ..models import Group, Post, User
@@ -219,3 +222,78 @@ class PaginatorViewsTest(TestCase):
             response = self.client.get(url)
             amount_posts = len(response.context.get('page_obj').object_list)
             self.assertEqual(amount_posts, AMOUNT_POST_CYCLE)
+
+
+class CursorPaginatorViewsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.author, text=f'Тестовый пост {i}', group=cls.group)
+            for i in range(CLS_CYCLE)
+        )
+        cls.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse(
+                'posts:profile', kwargs={'username': cls.author.username}
+            ),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cursor_pages_walk_whole_feed(self):
+        """По токенам after/before лента листается без пропусков."""
+        expected = list(
+            Post.objects.order_by('-pub_date', '-id')
+            .values_list('pk', flat=True)
+        )
+        for url in self.urls:
+            with self.subTest(url=url):
+                first_page = self.client.get(url, {'after': ''}).context[
+                    'page_obj'
+                ]
+                self.assertFalse(first_page.has_previous())
+                self.assertTrue(first_page.has_next())
+                second_page = self.client.get(
+                    url, {'after': first_page.next_cursor}
+                ).context['page_obj']
+                self.assertEqual(len(second_page), AMOUNT_POST_CYCLE)
+                self.assertFalse(second_page.has_next())
+                self.assertEqual(
+                    [post.pk for post in first_page]
+                    + [post.pk for post in second_page],
+                    expected,
+                )
+                back_page = self.client.get(
+                    url, {'before': second_page.previous_cursor}
+                ).context['page_obj']
+                self.assertEqual(
+                    [post.pk for post in back_page],
+                    [post.pk for post in first_page],
+                )
+
+    def test_cursor_page_skips_count(self):
+        """Страница по курсору не выполняет COUNT(*)."""
+        first_page = self.client.get(
+            reverse('posts:index'), {'after': ''}
+        ).context['page_obj']
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(
+                reverse('posts:index'), {'after': first_page.next_cursor}
+            )
+        for query in context.captured_queries:
+            with self.subTest(sql=query['sql']):
+                self.assertNotIn('COUNT(', query['sql'])
+
+    def test_broken_cursor_returns_first_page(self):
+        """Испорченный токен отдаёт первую страницу."""
+        response = self.client.get(reverse('posts:index'), {'after': '!!'})
+        self.assertEqual(len(response.context['page_obj']), POSTS_PAGE)
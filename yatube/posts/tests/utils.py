@@ -0,0 +1,34 @@
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """Примесь для TestCase с проверкой бюджета SQL-запросов."""
+
+    @contextmanager
+    def assertQueryBudget(self, budget):
+        """Тест падает, если внутри блока выполнено больше budget запросов."""
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        executed = [query['sql'] for query in context.captured_queries]
+        self.assertLessEqual(
+            len(executed),
+            budget,
+            'Превышен бюджет запросов ({} > {}):\n{}'.format(
+                len(executed), budget, '\n'.join(executed)
+            ),
+        )
+
+
+def run_commit_hooks(using=DEFAULT_DB_ALIAS):
+    """Выполняет отложенные on_commit, как если бы транзакция завершилась.
+
+    TestCase откатывает транзакцию, и сами по себе они не срабатывают.
+    """
+    connection = connections[using]
+    while connection.run_on_commit:
+        callbacks, connection.run_on_commit = connection.run_on_commit, []
+        for _, callback in callbacks:
+            callback()
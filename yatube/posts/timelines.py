@@ -0,0 +1,332 @@
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router, transaction
+from django.utils.module_loading import import_string
+
+from .cache import INDEX_SCOPE, author_scope, group_scope
+from .constants import (
+    TIMELINE_LENGTH, TIMELINE_LOCK_TIMEOUT, TIMELINE_LOCK_WAIT,
+    TIMELINE_TIMEOUT,
+)
+from .models import Post
+
+
+class CacheTimelineBackend:
+    """Ленты хранятся в кэше Django и общие для всех его клиентов.
+
+    Запись идёт под блокировкой cache.add, так что параллельные
+    изменения одной ленты не затирают друг друга. Ленты общие для
+    процессов, только если общий сам кэш: с locmem у каждого воркера
+    свои ленты, и правки из других процессов в них не попадут.
+    """
+
+    def get(self, key):
+        return cache.get(key)
+
+    def set(self, key, state):
+        cache.set(key, state, TIMELINE_TIMEOUT)
+
+    def delete(self, key):
+        cache.delete(key)
+
+    @contextmanager
+    def lock(self, key, wait=True):
+        """Блокировка ленты; отдаёт False, если её не удалось взять."""
+        lock_key, token = f'{key}:lock', uuid4().hex
+        deadline = time.monotonic() + TIMELINE_LOCK_TIMEOUT
+        locked = cache.add(lock_key, token, TIMELINE_LOCK_TIMEOUT)
+        while not locked and wait and time.monotonic() < deadline:
+            time.sleep(TIMELINE_LOCK_WAIT)
+            locked = cache.add(lock_key, token, TIMELINE_LOCK_TIMEOUT)
+        try:
+            yield locked
+        finally:
+            if locked and cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+    def update(self, key, change):
+        with self.lock(key) as locked:
+            if not locked:
+                # Без блокировки правку не применить: лента
+                # перестроится из базы при следующем чтении.
+                self.delete(key)
+                return
+            state = self.get(key)
+            if state is not None:
+                self.set(key, change(state))
+
+    def reset(self, key):
+        with self.lock(key):
+            self.delete(key)
+
+
+class LocalTimelineBackend(CacheTimelineBackend):
+    """Ленты хранятся в памяти процесса.
+
+    Подходит только для одного процесса: воркеры не видят правок
+    друг друга, и их ленты расходятся с базой.
+    """
+
+    def __init__(self):
+        self.timelines = {}
+        self.mutex = threading.Lock()
+
+    def get(self, key):
+        return self.timelines.get(key)
+
+    def set(self, key, state):
+        self.timelines[key] = state
+
+    def delete(self, key):
+        self.timelines.pop(key, None)
+
+    @contextmanager
+    def lock(self, key, wait=True):
+        if wait:
+            locked = self.mutex.acquire(timeout=TIMELINE_LOCK_TIMEOUT)
+        else:
+            locked = self.mutex.acquire(blocking=False)
+        try:
+            yield locked
+        finally:
+            if locked:
+                self.mutex.release()
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    return import_string(settings.TIMELINE_BACKEND)()
+
+
+class TimelineChange:
+    """Правка лент, отложенная до коммита транзакции с постом.
+
+    Пока правка ждёт коммита, это соединение читает затронутые ленты
+    прямо из базы и не сохраняет их: так видны свои посты, а после
+    отката в хранилище не остаётся их id.
+    """
+
+    def __init__(self, timelines, apply):
+        self.names = {timeline.name for timeline in timelines}
+        self.apply = apply
+
+    def __call__(self):
+        self.apply()
+
+
+def has_pending_changes(name):
+    """Ждёт ли лента name коммита правок в текущей транзакции."""
+    return any(
+        isinstance(callback, TimelineChange) and name in callback.names
+        for _, callback in transaction.get_connection().run_on_commit
+    )
+
+
+class Timeline:
+    """Ограниченный список последних постов одной ленты.
+
+    Состояние — пара (entries, count): до TIMELINE_LENGTH пар
+    (pub_date, id) от новых к старым и число всех постов ленты.
+    entries всегда начало ленты из базы; если их столько же, сколько
+    count, в ленте все её посты.
+    """
+
+    def __init__(self, name, **filters):
+        self.name = name
+        self.filters = filters
+
+    @property
+    def key(self):
+        return f'posts:timeline:{self.name}'
+
+    def get_state(self):
+        if has_pending_changes(self.name):
+            return self.load()
+        state = get_backend().get(self.key)
+        if state is None:
+            state = self.rebuild()
+        return state
+
+    def load(self):
+        """Читает состояние ленты с primary; COUNT(*) только для длинных.
+
+        Лента хранится общей для всех запросов, поэтому её не строят по
+        отстающей реплике, даже внутри read_from_replica.
+        """
+        posts = Post.objects.using(
+            router.db_for_write(Post)
+        ).filter(**self.filters)
+        entries = list(
+            posts.order_by('-pub_date', '-id')
+            .values_list('pub_date', 'id')[:TIMELINE_LENGTH]
+        )
+        count = len(entries)
+        if count == TIMELINE_LENGTH:
+            count = posts.count()
+        return entries, count
+
+    def rebuild(self):
+        """Перечитывает ленту и сохраняет, если она не занята правкой."""
+        backend = get_backend()
+        with backend.lock(self.key, wait=False) as locked:
+            state = self.load()
+            if locked and not has_pending_changes(self.name):
+                backend.set(self.key, state)
+        return state
+
+    def add(self, entry, new=True):
+        def change(state):
+            entries, count = state
+            complete = len(entries) == count
+            entries = [item for item in entries if item[1] != entry[1]]
+            if complete or (entries and entry > entries[-1]):
+                entries.append(entry)
+                entries.sort(reverse=True)
+            return entries[:TIMELINE_LENGTH], (count + 1 if new else count)
+
+        get_backend().update(self.key, change)
+
+    def remove(self, post_id):
+        def change(state):
+            entries, count = state
+            entries = [item for item in entries if item[1] != post_id]
+            return entries, max(count - 1, len(entries))
+
+        get_backend().update(self.key, change)
+
+
+def index_timeline():
+    return Timeline(INDEX_SCOPE)
+
+
+def group_timeline(group_id):
+    return Timeline(group_scope(group_id), group_id=group_id)
+
+
+def author_timeline(author_id):
+    if not settings.TIMELINE_AUTHORS:
+        return None
+    return Timeline(author_scope(author_id), author_id=author_id)
+
+
+def get_post_timelines(author_id, group_id):
+    """Ленты, в которые попадает пост автора author_id в группе group_id."""
+    timelines = [index_timeline(), author_timeline(author_id)]
+    if group_id is not None:
+        timelines.append(group_timeline(group_id))
+    return {
+        timeline.name: timeline
+        for timeline in timelines if timeline is not None
+    }
+
+
+def update_timelines(post, created=False, deleted=False):
+    """Раскладывает пост по лентам при сохранении и удалении.
+
+    Ленты меняются только после коммита: откаченный пост в них не
+    попадёт. До коммита сама транзакция видит ленты из базы.
+    """
+    counted = getattr(post, '_counted_fields', {})
+    old = {} if created else get_post_timelines(
+        counted.get('author_id', post.author_id),
+        counted.get('group_id', post.group_id),
+    )
+    new = {} if deleted else get_post_timelines(post.author_id, post.group_id)
+    post_id, entry = post.pk, (post.pub_date, post.pk)
+
+    def apply():
+        for name, timeline in old.items():
+            if name not in new:
+                timeline.remove(post_id)
+        for name, timeline in new.items():
+            timeline.add(entry, new=name not in old)
+
+    transaction.on_commit(
+        TimelineChange([*old.values(), *new.values()], apply)
+    )
+
+
+def reset_timelines(posts):
+    """Сбрасывает ленты постов после коммита; они перестроятся при чтении."""
+    timelines = {
+        timeline.name: timeline
+        for post in posts
+        for timeline in get_post_timelines(
+            post.author_id, post.group_id
+        ).values()
+    }.values()
+
+    def apply():
+        backend = get_backend()
+        for timeline in timelines:
+            backend.reset(timeline.key)
+
+    transaction.on_commit(TimelineChange(timelines, apply))
+
+
+def rebuild_timelines():
+    """Перестраивает ленты главной, всех групп и авторов с постами."""
+    timelines = [index_timeline()]
+    group_ids = (
+        Post.objects.filter(group__isnull=False)
+        .order_by().values_list('group_id', flat=True).distinct()
+    )
+    timelines.extend(group_timeline(group_id) for group_id in group_ids)
+    if settings.TIMELINE_AUTHORS:
+        author_ids = (
+            Post.objects.order_by()
+            .values_list('author_id', flat=True).distinct()
+        )
+        timelines.extend(
+            author_timeline(author_id) for author_id in author_ids
+        )
+    for timeline in timelines:
+        timeline.rebuild()
+    return len(timelines)
+
+
+class TimelineFeed:
+    """Лента для Paginator: id и число постов берутся из Timeline.
+
+    Страница в пределах ленты загружается одним запросом id__in,
+    COUNT(*) не нужен. Страницы глубже ленты читаются из queryset с
+    OFFSET, как раньше.
+    """
+
+    def __init__(self, timeline, queryset):
+        self.timeline = timeline
+        self.queryset = queryset
+        self.state = None
+
+    def get_state(self):
+        if self.state is None:
+            self.state = self.timeline.get_state()
+        return self.state
+
+    def count(self):
+        return self.get_state()[1]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, page):
+        entries, count = self.get_state()
+        if page.stop > len(entries) and len(entries) < count:
+            return list(self.queryset[page])
+        ids = [post_id for _, post_id in entries[page]]
+        if not ids:
+            return []
+        posts = self.queryset.in_bulk(ids)
+        if len(posts) < len(ids):
+            # Поста из ленты нет в базе. Если это primary, лента устарела
+            # и сбрасывается; реплика могла просто ещё не получить пост.
+            if self.queryset.db == router.db_for_write(Post):
+                get_backend().reset(self.timeline.key)
+            return list(self.queryset[page])
+        return [posts[pk] for pk in ids]
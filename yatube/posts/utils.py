@@ -1,11 +1,206 @@
-from django.core.paginator import Paginator
+from operator import attrgetter
 
-from .constants import POSTS_PAGE
+from django.core.paginator import Page, Paginator
+from django.db.models import Max, Q
+from django.utils.functional import cached_property
+from django.utils.dateparse import parse_datetime
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 
+from .constants import (
+    ADMIN_EXACT_COUNT, PAGES_ON_EACH_SIDE, PAGES_ON_ENDS, POSTS_PAGE,
+)
+from .timelines import TimelineFeed
 
-def paginator_func(request, post_list):
-    """Функция paginator."""
-    paginator_variable = Paginator(post_list, POSTS_PAGE)
+
+class WindowedPage(Page):
+    """Страница с ограниченным списком ссылок на соседние страницы."""
+
+    @property
+    def elided_page_range(self):
+        return list(self.paginator.get_elided_page_range(self.number))
+
+
+class WindowedPaginator(Paginator):
+    """Paginator, который не выводит ссылку на каждую страницу.
+
+    Список страниц содержит первые и последние PAGES_ON_ENDS страниц и
+    PAGES_ON_EACH_SIDE страниц вокруг текущей, пропуски заменяются на
+    ELLIPSIS. Размер HTML навигации не зависит от длины ленты.
+    """
+    ELLIPSIS = '…'
+
+    def _get_page(self, *args, **kwargs):
+        return WindowedPage(*args, **kwargs)
+
+    def get_elided_page_range(self, number=1,
+                              on_each_side=PAGES_ON_EACH_SIDE,
+                              on_ends=PAGES_ON_ENDS):
+        number = self.validate_number(number)
+        if self.num_pages <= (on_each_side + on_ends) * 2 + 1:
+            yield from self.page_range
+            return
+
+        if number > on_each_side + on_ends + 2:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+            yield from range(number - on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+
+        if number < self.num_pages - on_each_side - on_ends - 1:
+            yield from range(number + 1, number + on_each_side + 1)
+            yield self.ELLIPSIS
+            yield from range(self.num_pages - on_ends + 1, self.num_pages + 1)
+        else:
+            yield from range(number + 1, self.num_pages + 1)
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator админки без полного COUNT(*) по большой таблице.
+
+    Точно считаются только первые ADMIN_EXACT_COUNT строк. Если строк
+    больше и выборка не отфильтрована, число оценивается по максимальному
+    первичному ключу: SQLite берёт его одним шагом по B-дереву. Для
+    отфильтрованной выборки страницы ограничиваются первыми
+    ADMIN_EXACT_COUNT строками.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list.order_by()
+        count = queryset[:ADMIN_EXACT_COUNT].count()
+        if count < ADMIN_EXACT_COUNT or queryset.query.has_filters():
+            return count
+
+        estimate = queryset.aggregate(estimate=Max('pk'))['estimate']
+        return max(count, estimate)
+
+
+# Ключ (pub_date, id) поста; для строк values_list передаётся свой.
+post_key = attrgetter('pub_date', 'pk')
+
+
+def encode_cursor(pub_date, pk):
+    """Кодирует ключ (pub_date, id) в непрозрачный токен."""
+    value = '{}|{}'.format(pub_date.isoformat(), pk)
+    return urlsafe_base64_encode(value.encode())
+
+
+def decode_cursor(token):
+    """Возвращает ключ (pub_date, id) из токена или None."""
+    try:
+        pub_date, pk = force_str(urlsafe_base64_decode(token)).split('|')
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (ValueError, TypeError):
+        return None
+    if pub_date is None:
+        return None
+
+    return pub_date, pk
+
+
+class CursorPage(Page):
+    """Страница keyset-пагинации с токенами соседних страниц."""
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        super().__init__(object_list, None, paginator)
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return '<Cursor page>'
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class CursorPaginator(Paginator):
+    """Paginator по ключу (pub_date, id) без COUNT(*) и OFFSET.
+
+    Стоимость страницы не зависит от её глубины: выборка идёт
+    по условию на ключ последнего показанного поста. Функция key
+    достаёт ключ из элемента выборки: поста или строки values_list.
+    """
+
+    def __init__(self, object_list, per_page, key=post_key, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.key = key
+
+    def encode(self, item):
+        return encode_cursor(*self.key(item))
+
+    def cursor_page(self, after=None, before=None):
+        """Страница после токена after или перед токеном before."""
+        before_key = decode_cursor(before) if before else None
+        if before_key is not None:
+            return self._page_before(*before_key)
+
+        after_key = decode_cursor(after) if after else None
+        return self._page_after(after_key)
+
+    def _page_after(self, key):
+        queryset = self.object_list.order_by('-pub_date', '-id')
+        if key is not None:
+            pub_date, pk = key
+            # Условие pub_date <= избыточно, но даёт SQLite начать чтение
+            # индекса с курсора, а не с первой страницы.
+            queryset = queryset.filter(
+                Q(pub_date__lt=pub_date) | Q(id__lt=pk),
+                pub_date__lte=pub_date,
+            )
+        posts = list(queryset[:self.per_page + 1])
+        next_cursor = None
+        if len(posts) > self.per_page:
+            posts = posts[:self.per_page]
+            next_cursor = self.encode(posts[-1])
+        previous_cursor = None
+        if key is not None and posts:
+            previous_cursor = self.encode(posts[0])
+
+        return CursorPage(posts, self, next_cursor, previous_cursor)
+
+    def _page_before(self, pub_date, pk):
+        queryset = self.object_list.order_by('pub_date', 'id').filter(
+            Q(pub_date__gt=pub_date) | Q(id__gt=pk),
+            pub_date__gte=pub_date,
+        )
+        posts = list(queryset[:self.per_page + 1])
+        previous_cursor = None
+        if len(posts) > self.per_page:
+            posts = posts[:self.per_page]
+            previous_cursor = self.encode(posts[-1])
+        posts.reverse()
+        next_cursor = self.encode(posts[-1]) if posts else None
+
+        return CursorPage(posts, self, next_cursor, previous_cursor)
+
+
+def paginator_func(request, post_list, count=None, timeline=None):
+    """Функция paginator.
+
+    Если в запросе есть ?after= или ?before=, лента листается
+    по курсору, иначе по номеру страницы ?page=. Известное заранее
+    число постов count избавляет paginator от COUNT(*), а timeline
+    отдаёт id постов страницы без сортировки таблицы.
+    """
+    if 'after' in request.GET or 'before' in request.GET:
+        paginator_variable = CursorPaginator(post_list, POSTS_PAGE)
+        return paginator_variable.cursor_page(
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+        )
+
+    if timeline is not None:
+        post_list = TimelineFeed(timeline, post_list)
+    paginator_variable = WindowedPaginator(post_list, POSTS_PAGE)
+    if count is not None:
+        paginator_variable.count = count
     page_number = request.GET.get('page')
     page_obj = paginator_variable.get_page(page_number)
 
@@ -1,55 +1,129 @@
-from django.shortcuts import render, get_object_or_404, redirect
+from urllib.parse import urlencode
+
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.shortcuts import render, get_object_or_404, redirect
 
+from core.auth import is_anonymous_request
+from core.db import pin_primary, read_from_replica
+
+from .cache import (
+    cache_anonymous_page,
+    group_posts_scopes,
+    index_scopes,
+    post_detail_scopes,
+    profile_scopes,
+)
+from .constants import POSTS_PAGE
+from .conditional import conditional_page
+from .counters import get_author_posts_count
+from .feeds import (
+    AUTHOR_HEADER_FIELDS, GROUP_HEADER_FIELDS, POST_DETAIL_FIELDS, get_feed,
+)
 from .forms import PostForm
 from .models import Post, Group, User
-from .utils import paginator_func
+from .search import SearchResults
+from .timelines import author_timeline, group_timeline, index_timeline
+from .utils import WindowedPaginator, paginator_func
 
 
+@read_from_replica
+@conditional_page(index_scopes)
+@cache_anonymous_page(index_scopes)
 def index(request):
     """View функция для index."""
-    post_list = Post.objects.all().order_by('-pub_date')
+    post_list = get_feed()
     context = {
-        'page_obj': paginator_func(request, post_list),
+        'page_obj': paginator_func(
+            request, post_list, timeline=index_timeline()
+        ),
     }
 
     return render(request, 'posts/index.html', context)
 
 
+@read_from_replica
+@conditional_page(group_posts_scopes)
+@cache_anonymous_page(group_posts_scopes)
 def group_posts(request, slug):
     """View функция для group_posts."""
-    group = get_object_or_404(Group, slug=slug)
-    post_list = group.posts.select_related('group').order_by('-pub_date')
+    group = get_object_or_404(
+        Group.objects.only(*GROUP_HEADER_FIELDS), slug=slug
+    )
+    post_list = get_feed(group=group)
     context = {
         'group': group,
-        'page_obj': paginator_func(request, post_list),
+        'page_obj': paginator_func(
+            request,
+            post_list,
+            count=group.posts_count,
+            timeline=group_timeline(group.pk),
+        ),
     }
 
     return render(request, 'posts/group_list.html', context)
 
 
+@read_from_replica
+@conditional_page(profile_scopes)
+@cache_anonymous_page(profile_scopes)
 def profile(request, username):
     """View функция для profile."""
-    author = get_object_or_404(User, username=username)
-    post_list = author.posts.select_related('group').order_by('-pub_date')
+    author = get_object_or_404(
+        User.objects.select_related('stats').only(*AUTHOR_HEADER_FIELDS),
+        username=username,
+    )
+    posts_count = get_author_posts_count(author)
+    post_list = get_feed(author=author)
     context = {
         'author': author,
-        'page_obj': paginator_func(request, post_list),
+        'posts_count': posts_count,
+        'page_obj': paginator_func(
+            request,
+            post_list,
+            count=posts_count,
+            timeline=author_timeline(author.pk),
+        ),
     }
 
     return render(request, 'posts/profile.html', context)
 
 
+@read_from_replica
+@conditional_page(post_detail_scopes)
+@cache_anonymous_page(post_detail_scopes)
 def post_detail(request, post_id):
     """View функция для post_detail."""
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_object_or_404(
+        Post.objects.select_related('author__stats', 'group')
+        .only(*POST_DETAIL_FIELDS),
+        pk=post_id,
+    )
     context = {
         'post': post,
+        'posts_count': get_author_posts_count(post.author),
+        'is_author': (
+            not is_anonymous_request(request)
+            and request.user.pk == post.author_id
+        ),
     }
 
     return render(request, 'posts/post_detail.html', context)
 
 
+def search(request):
+    """View функция для поиска по тексту постов."""
+    query = request.GET.get('q', '').strip()
+    paginator_variable = WindowedPaginator(SearchResults(query), POSTS_PAGE)
+    context = {
+        'query': query,
+        'query_prefix': urlencode({'q': query}) + '&',
+        'page_obj': paginator_variable.get_page(request.GET.get('page')),
+    }
+
+    return render(request, 'posts/search.html', context)
+
+
 @login_required
 def post_create(request):
     """View функция для создания записи."""
@@ -57,7 +131,9 @@ def post_create(request):
     if form.is_valid():
         post = form.save(commit=False)
         post.author = request.user
-        post.save()
+        with transaction.atomic():
+            post.save()
+        pin_primary(request)
 
         return redirect('posts:profile', post.author)
 
@@ -74,7 +150,9 @@ def post_edit(request, post_id):
         return redirect('posts:post_detail', post_id=post_id)
 
     if form.is_valid():
-        form.save()
+        with transaction.atomic():
+            form.save()
+        pin_primary(request)
 
         return redirect('posts:post_detail', post_id=post_id)
 
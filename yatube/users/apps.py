@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     """Config для приложения Users."""
     name = 'users'
+
+    def ready(self):
+        from . import signals  # noqa: F401
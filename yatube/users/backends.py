@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+
+def user_cache_key(user_id):
+    return f'users:user:{user_id}'
+
+
+def forget_user(user_id):
+    """Удаляет пользователя из кэша."""
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берёт пользователя сессии из кэша.
+
+    Кэш сбрасывается при любом сохранении пользователя (в том числе
+    при смене пароля) и при выходе. Сброс виден всем процессам только
+    с общим кэшем, иначе старый пользователь живёт до конца
+    USER_CACHE_TIMEOUT.
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
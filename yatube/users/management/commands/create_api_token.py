@@ -0,0 +1,28 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from users.models import ApiToken
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Выпускает токен API пользователю и печатает его ключ.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('--name', default='', help='Название токена.')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(
+                f'Пользователь {options["username"]} не найден.'
+            )
+
+        token, key = ApiToken.issue(user, options['name'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Токен {token.pk} выпущен. Ключ показывается один раз:'
+        ))
+        self.stdout.write(key)
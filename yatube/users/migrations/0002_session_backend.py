@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import caches
+from django.db import migrations
+
+# Сессии хранят путь backend, которым пользователь вошёл. ModelBackend
+# убран из AUTHENTICATION_BACKENDS, чтобы неудачный вход не проверял
+# пароль дважды; его сессии переводятся на CachedModelBackend.
+BACKEND_SESSION_KEY = '_auth_user_backend'
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+CACHED_MODEL_BACKEND = 'users.backends.CachedModelBackend'
+SESSION_CACHE_PREFIX = 'django.contrib.sessions.cached_db'
+
+
+def replace_session_backend(old, new):
+    def migrate(apps, schema_editor):
+        Session = apps.get_model('sessions', 'Session')
+        store = SessionStore()
+        session_cache = caches[settings.SESSION_CACHE_ALIAS]
+        for session in Session.objects.using(
+            schema_editor.connection.alias
+        ).iterator():
+            data = store.decode(session.session_data)
+            if data.get(BACKEND_SESSION_KEY) != old:
+                continue
+            data[BACKEND_SESSION_KEY] = new
+            session.session_data = store.encode(data)
+            session.save(update_fields=('session_data',))
+            session_cache.delete(SESSION_CACHE_PREFIX + session.session_key)
+
+    return migrate
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sessions', '0001_initial'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            replace_session_backend(MODEL_BACKEND, CACHED_MODEL_BACKEND),
+            replace_session_backend(CACHED_MODEL_BACKEND, MODEL_BACKEND),
+        ),
+    ]
@@ -0,0 +1,48 @@
+import hashlib
+import secrets
+
+from django.contrib.auth import get_user_model
+from django.db import models
+
+User = get_user_model()
+
+
+class ApiToken(models.Model):
+    """Токен API пользователя.
+
+    В базе хранится только SHA-256 ключа: сам ключ показывается один
+    раз, при выпуске токена.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='api_tokens',
+        verbose_name="Пользователь",
+    )
+    name = models.CharField(
+        verbose_name="Название", max_length=100, blank=True,
+    )
+    digest = models.CharField(
+        verbose_name="SHA-256 ключа", max_length=64, unique=True,
+        editable=False,
+    )
+    created = models.DateTimeField(
+        verbose_name="Дата выпуска", auto_now_add=True,
+    )
+
+    def __str__(self) -> str:
+        """Метод вывода пользователя и названия токена."""
+        return f'{self.user}: {self.name}'
+
+    @staticmethod
+    def hash_key(key):
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @classmethod
+    def issue(cls, user, name=''):
+        """Выпускает токен и возвращает его вместе с ключом."""
+        key = secrets.token_urlsafe(32)
+        token = cls.objects.create(
+            user=user, name=name, digest=cls.hash_key(key)
+        )
+        return token, key
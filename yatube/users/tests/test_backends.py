@@ -0,0 +1,85 @@
+from importlib import import_module
+from unittest import mock
+
+from django.apps import apps
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..backends import user_cache_key
+
+User = get_user_model()
+
+
+class CachedUserTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='TestUser', password='Old-password-123'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(CachedUserTests.user)
+
+    def test_logged_in_page_skips_session_and_user_queries(self):
+        """Сессия и пользователь берутся из кэша без запросов к базе."""
+        url = reverse('about:author')
+        self.authorized_client.get(url)
+        with self.assertNumQueries(0):
+            response = self.authorized_client.get(url)
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_password_change_forgets_user(self):
+        """Смена пароля сбрасывает пользователя в кэше."""
+        self.authorized_client.get(reverse('about:author'))
+        self.assertIsNotNone(cache.get(user_cache_key(self.user.pk)))
+        self.authorized_client.post(
+            reverse('users:password_change_form'),
+            {
+                'old_password': 'Old-password-123',
+                'new_password1': 'New-password-456',
+                'new_password2': 'New-password-456',
+            },
+        )
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        response = self.authorized_client.get(reverse('about:author'))
+        self.assertTrue(response.context['user'].is_authenticated)
+
+    def test_logout_forgets_user(self):
+        """Выход сбрасывает пользователя в кэше."""
+        self.authorized_client.get(reverse('about:author'))
+        self.authorized_client.get(reverse('users:logout'))
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+
+    def test_failed_login_hashes_password_once(self):
+        """Неудачный вход проверяет пароль одним backend, один раз."""
+        encode = PBKDF2PasswordHasher.encode
+        for username in ('TestUser', 'Unknown'):
+            with self.subTest(username=username), mock.patch.object(
+                PBKDF2PasswordHasher, 'encode',
+                autospec=True, side_effect=encode,
+            ) as hasher:
+                self.assertIsNone(
+                    authenticate(username=username, password='wrong')
+                )
+                self.assertEqual(hasher.call_count, 1)
+
+    def test_model_backend_sessions_migrated(self):
+        """Миграция переводит сессии ModelBackend на CachedModelBackend."""
+        migration = import_module('users.migrations.0002_session_backend')
+        client = Client()
+        client.force_login(self.user, backend=migration.MODEL_BACKEND)
+        response = client.get(reverse('about:author'))
+        self.assertFalse(response.context['user'].is_authenticated)
+        migrate = migration.replace_session_backend(
+            migration.MODEL_BACKEND, migration.CACHED_MODEL_BACKEND
+        )
+        migrate(apps, mock.Mock(connection=connection))
+        response = client.get(reverse('about:author'))
+        self.assertEqual(response.context['user'], self.user)
@@ -0,0 +1,48 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+
+from ..models import ApiToken
+from ..tokens import get_token_user
+
+User = get_user_model()
+
+
+class ApiTokenTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='TestUser')
+
+    def get_user(self, authorization):
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=authorization)
+        return get_token_user(request)
+
+    def test_token_stores_only_digest(self):
+        """В базе лежит хэш ключа, а не сам ключ."""
+        token, key = ApiToken.issue(self.user, 'Импорт')
+        self.assertNotIn(key, token.digest)
+        self.assertEqual(token.digest, ApiToken.hash_key(key))
+
+    def test_get_token_user(self):
+        """Пользователь определяется по заголовку Authorization."""
+        _, key = ApiToken.issue(self.user)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_user(f'Token {key}'), self.user)
+        self.assertIsNone(self.get_user(f'Bearer {key}'))
+        self.assertIsNone(self.get_user('Token '))
+        self.assertIsNone(self.get_user('Token wrong-key'))
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(self.get_user(f'Token {key}'))
+
+    def test_create_api_token_command(self):
+        """Команда create_api_token печатает ключ нового токена."""
+        out = StringIO()
+        call_command('create_api_token', 'TestUser', '--name', 'CI',
+                     stdout=out)
+        key = out.getvalue().splitlines()[-1]
+        self.assertEqual(self.get_user(f'Token {key}'), self.user)
+        self.assertEqual(ApiToken.objects.get().name, 'CI')
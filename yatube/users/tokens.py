@@ -0,0 +1,24 @@
+from .models import ApiToken
+
+TOKEN_KEYWORD = 'Token'
+
+
+def get_token_user(request):
+    """Активный пользователь из заголовка Authorization: Token <ключ>.
+
+    Без заголовка или с неизвестным ключом возвращает None. Пароли не
+    проверяются, поэтому неверный ключ обходится в один запрос.
+    """
+    keyword, _, key = request.META.get('HTTP_AUTHORIZATION', '').partition(
+        ' '
+    )
+    key = key.strip()
+    if keyword != TOKEN_KEYWORD or not key:
+        return None
+
+    token = (
+        ApiToken.objects.select_related('user')
+        .filter(digest=ApiToken.hash_key(key), user__is_active=True)
+        .first()
+    )
+    return token.user if token is not None else None
@@ -29,6 +29,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.profiling.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -38,16 +39,34 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Доля запросов, для которых собираются SQL- и шаблонные метрики,
+# и размер скользящего окна замеров на каждый view.
+REQUEST_PROFILING_SAMPLE_RATE = 0.01
+
+REQUEST_PROFILING_WINDOW = 1000
+
 ROOT_URLCONF = 'yatube.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+# Скомпилированные шаблоны держатся в памяти процесса и прогреваются
+# при старте; при DEBUG шаблоны перечитываются с диска.
+CACHED_TEMPLATES = not DEBUG
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': (
+                [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)]
+                if CACHED_TEMPLATES else TEMPLATE_LOADERS
+            ),
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -61,14 +80,93 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
+# ASGI-вариант запуска: yatube.asgi.application, например
+# uvicorn yatube.asgi:application. Запросы Django выполняются в пуле из
+# ASGI_THREADS потоков, медленных клиентов обслуживает цикл событий.
+ASGI_THREADS = 8
+
 
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': 600,
+        'OPTIONS': {
+            'timeout': 5,
+        },
     }
 }
 
+# Реплики только для чтения: алиасы из DATABASES, с которых читают
+# index, group_posts, profile и post_detail. Для локальной проверки
+# подойдёт копия db.sqlite3, например:
+# DATABASES['replica'] = {
+#     **DATABASES['default'],
+#     'NAME': os.path.join(BASE_DIR, 'db.replica.sqlite3'),
+#     'TEST': {'MIRROR': 'default'},
+# }
+# DATABASE_REPLICAS = ['replica']
+DATABASE_REPLICAS = []
+
+DATABASE_ROUTERS = ['core.db.ReplicaRouter']
+
+# Сколько секунд после записи пользователь читает только с primary.
+REPLICA_PIN_SECONDS = 10
+
+# Выполняются для каждого нового соединения с SQLite. WAL позволяет
+# читать ленты, пока post_create/post_edit пишут в базу; пустой
+# словарь возвращает настройки SQLite по умолчанию.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,
+    'mmap_size': 268435456,
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+}
+
+# Подойдёт и django.core.cache.backends.filebased.FileBasedCache,
+# если кэш должен быть общим для нескольких процессов. При нескольких
+# процессах общий кэш обязателен: в нём лежат версии страниц, по
+# которым сбрасывается кэш страниц и строятся ETag.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'yatube',
+    }
+}
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Единственный backend: второй ModelBackend проверял бы пароль при
+# неудачном входе ещё раз. Сессии ModelBackend переводит на него
+# миграция users.0002_session_backend.
+AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
+
+# Сколько секунд пользователь сессии хранится в кэше. Сброс при смене
+# пароля и выходе виден только процессам с общим кэшем; с locmem другие
+# процессы держат старого пользователя до конца этого срока, поэтому он
+# короткий.
+USER_CACHE_TIMEOUT = 60
+
+# Хранилище лент последних постов (posts.timelines). CacheTimelineBackend
+# держит ленты в CACHES и общий для процессов, если общий кэш;
+# LocalTimelineBackend хранит их в памяти одного процесса. При нескольких
+# воркерах нужен CacheTimelineBackend с общим кэшем: иначе ленты
+# процессов расходятся с базой.
+TIMELINE_BACKEND = 'posts.timelines.CacheTimelineBackend'
+
+# Вести ли отдельную ленту для каждого автора (страница profile).
+TIMELINE_AUTHORS = True
+
+# Задачи после записи поста (posts.jobs) лежат в таблице outbox. При True
+# после коммита их разбирает фоновый поток процесса; команда
+# run_post_jobs подберёт оставшиеся, например после перезапуска.
+# manage.py test выключает его через core.test_runner.TestRunner.
+POST_JOBS_IN_PROCESS = True
+
+TEST_RUNNER = 'core.test_runner.TestRunner'
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {